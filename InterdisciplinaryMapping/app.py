@@ -28,6 +28,10 @@ def main():
     builder = GraphBuilder(personnel_source, publication_source)
     graph = builder.build()
 
+    # Print ingest validation summaries
+    print(personnel_source.report)
+    print(publication_source.report)
+
     # Print summary + full graph
     print(f"Loaded graph with {len(graph.nodes())} nodes.")
     print(graph)
@@ -8,6 +8,74 @@
 //
 // Entry: call window.IM_initUI() after the graph is drawn. It expects
 // global `network`, `nodes`, `edges`, and `window.AP_PEOPLE` to exist.
+// Pages built with --delta embed no graph; they call
+// window.IM_loadGraph(manifestUrl, IM_initUI) to fill `nodes`/`edges` first.
+
+// Apply a delta (visualization/delta.py) to the `nodes`/`edges` DataSets.
+// Returns false, changing nothing, unless the delta starts at the version
+// currently shown (window.AP_GRAPH_VERSION).
+window.IM_patchGraph = function(delta){
+  if (!delta || delta.from !== window.AP_GRAPH_VERSION) return false;
+  var nd = delta.nodes || {}, ed = delta.edges || {};
+  if (ed.remove && ed.remove.length) {
+    var byKey = {}, ids = [];
+    edges.get().forEach(function(e){ byKey[e.from + '\u0001' + e.to] = e.id; });
+    ed.remove.forEach(function(k){ var id = byKey[k[0] + '\u0001' + k[1]]; if (id !== undefined) ids.push(id); });
+    if (ids.length) edges.remove(ids);
+  }
+  if (nd.remove && nd.remove.length) nodes.remove(nd.remove);
+  var ups = (nd.add || []).concat(nd.update || []);
+  if (ups.length) nodes.update(ups);
+  if (ed.add && ed.add.length) edges.add(ed.add);
+  if (delta.people) window.AP_PEOPLE = delta.people;
+  if (delta.views) window.AP_VIEW_POSITIONS = delta.views;
+  window.AP_GRAPH_VERSION = delta.to;
+  return true;
+};
+
+// Load the graph from the versioned files listed in the manifest at `url`,
+// then call done(). Base files never change, so the one this browser loaded
+// last is usually still in its HTTP cache (at worst revalidated with a 304):
+// start from it and apply the deltas up to the latest version instead of
+// downloading the latest base. New visitors load the latest base directly.
+window.IM_loadGraph = function(url, done){
+  var dir = url.slice(0, url.lastIndexOf('/') + 1), key = 'IM_graphVersion';
+  function getJSON(u, opts){
+    return fetch(u, opts).then(function(r){ if (!r.ok) throw new Error(u + ': HTTP ' + r.status); return r.json(); });
+  }
+  if (!window.fetch) { console && console.warn && console.warn('graph load needs fetch'); done(); return; }
+  getJSON(url, { cache: 'no-cache' }).then(function(m){
+    var deltas = m.deltas || {}, files = {}, seen = null;
+    (m.bases || []).forEach(function(b){ files[b[0]] = b[1]; });
+    try { seen = window.localStorage.getItem(key); } catch(e){}
+    if (m.search) window.AP_SEARCH_URL = dir + m.search;
+    function load(version){
+      return getJSON(dir + files[version]).then(function(g){
+        nodes.clear(); edges.clear();
+        nodes.add(g.nodes || []);
+        edges.add(g.edges || []);
+        window.AP_PEOPLE = g.people || [];
+        window.AP_VIEW_POSITIONS = g.views || {};
+        window.AP_GRAPH_VERSION = g.version;
+      });
+    }
+    // follow the chain to the latest version; if it breaks, load the latest base
+    function step(){
+      if (window.AP_GRAPH_VERSION === m.latest) return;
+      var file = deltas[window.AP_GRAPH_VERSION];
+      if (!file) return load(m.latest);
+      return getJSON(dir + file).then(function(d){ return window.IM_patchGraph(d) ? step() : load(m.latest); });
+    }
+    return load(seen && files[seen] ? seen : m.latest).then(step);
+  }).then(function(){
+    try { window.localStorage.setItem(key, window.AP_GRAPH_VERSION); } catch(e){}
+    try { network.fit(); } catch(e){}
+  }).catch(function(e){
+    var hint = (location.protocol === 'file:') ? ' (pages opened from file:// cannot fetch it; serve the folder over http)' : '';
+    console && console.warn && console.warn('graph load failed' + hint, e);
+  }).then(done);
+};
+
 window.IM_initUI = function() {
   try {
       // --- spacing helpers (moved here so they are available globally in this file) ---
@@ -27,17 +95,15 @@ window.IM_initUI = function() {
     try {
       edges.get().forEach(function(e){ __originalEdgeStyles[e.id] = { color: e.color, width: e.width }; });
     } catch (e) { /* edges may not be ready yet in some contexts */ }
+    // Edges restyled by the last highlight; only these need restoring
+    var __highlightedEdges = [];
     function __resetEdgeStyles(){
       try {
-        var allE = edges.get();
-        var ups = allE.map(function(e){
-          var orig = __originalEdgeStyles[e.id] || {};
-          var obj = { id: e.id };
-          if (orig.color !== undefined) obj.color = orig.color; else obj.color = '#666666';
-          if (orig.width !== undefined) obj.width = orig.width; else obj.width = 1;
-          if (e.hidden) obj.hidden = true;
-          return obj;
+        var ups = __highlightedEdges.filter(function(id){ return edges.get(id); }).map(function(id){
+          var orig = __originalEdgeStyles[id] || {};
+          return { id: id, color: (orig.color !== undefined) ? orig.color : '#666666', width: (orig.width !== undefined) ? orig.width : 1 };
         });
+        __highlightedEdges = [];
         if (ups.length) edges.update(ups);
       } catch (err) { console && console.warn && console.warn('resetEdgeStyles failed', err); }
     }
@@ -47,6 +113,7 @@ window.IM_initUI = function() {
         if (!nodeId) return;
         var conn = (network.getConnectedEdges && network.getConnectedEdges(nodeId)) || [];
         console && console.debug && console.debug('highlightEdgesForNode:', nodeId, 'connectedEdges:', conn);
+        __highlightedEdges = conn.slice();
         var upd = conn.map(function(eid){ return { id: eid, color: '#ff3333', width: 3 }; });
         if (upd.length) {
           console && console.debug && console.debug('updating edges:', upd);
@@ -54,6 +121,15 @@ window.IM_initUI = function() {
         }
       } catch (err) { console && console.warn && console.warn('highlightEdges failed', err); }
     }
+    function __clusterLine(n){
+      return (typeof n.community === 'number' && n.community >= 0) ? '<div class="info-line"><b>Cluster:</b> ' + (n.community + 1) + '</div>' : '';
+    }
+    // Link to the precomputed ego-network page (see visualization/ego.py)
+    function __egoLine(n){
+      if (!window.AP_EGO_BASE || n.kind !== 'person') return '';
+      var raw = String(n.id).replace(/^person:/, '').replace(/[^A-Za-z0-9_-]/g, '_');
+      return '<div class="info-line"><a href="' + window.AP_EGO_BASE + 'person-' + raw + '.html">Open collaborator map</a></div>';
+    }
     function __resetColors() {
       var ids = nodes.getIds();
       var updates = ids.map(function(id) { return { id: id, color: __originalColors[id] }; });
@@ -73,9 +149,12 @@ window.IM_initUI = function() {
         if (infoEl) infoEl.innerHTML = '<div class="info-title">Click a node to see details here</div>';
         // reset any edge highlighting when clicking empty space
         try { __resetEdgeStyles(); } catch(e){}
+        try { __bundleFocus(null); } catch(e){}
         return;
       }
       var selectedId = params.nodes[0];
+      // a selected node shows its own links even while edges are bundled
+      try { __bundleFocus(selectedId); } catch(e){}
       // highlight edges connected to the selected node
       try { __highlightEdgesForNode(selectedId); } catch(e){}
       var neighborIds = (network.getConnectedNodes && network.getConnectedNodes(selectedId)) || [];
@@ -89,7 +168,8 @@ window.IM_initUI = function() {
       if (n.kind === 'person') {
         var html = '<div class="info-title">' + (n.full_name || n.label) + '</div>' +
                    '<div class="info-line"><b>Subteam:</b> ' + (n.subteam || '—') + '</div>' +
-                   (n.value ? '<div class="info-line"><b>Publications:</b> ' + n.value + '</div>' : '');
+                   (n.value ? '<div class="info-line"><b>Publications:</b> ' + n.value + '</div>' : '') +
+                   __clusterLine(n) + __egoLine(n);
         infoEl.innerHTML = html;
       } else if (n.kind === 'pub') {
         var authors = (n.authors && n.authors.length) ? n.authors.join(', ') : '—';
@@ -99,7 +179,7 @@ window.IM_initUI = function() {
                     '<div class="info-line"><b>Type:</b> ' + (n.ptype || '—') + '</div>' +
                     '<div class="info-line"><b>Project Year:</b> ' + (n.year || '—') + '</div>' +
                     '<div class="info-line"><b>Authors:</b> ' + authors + '</div>' +
-                    doiLine;
+                    doiLine + __clusterLine(n);
         infoEl.innerHTML = html2;
       }
     }
@@ -132,7 +212,8 @@ window.IM_initUI = function() {
         if (n && n.kind === 'person') {
           var html = '<div class="info-title">' + (n.full_name || n.label) + '</div>' +
                      '<div class="info-line"><b>Subteam:</b> ' + (n.subteam || '—') + '</div>' +
-                     (n.value ? '<div class="info-line"><b>Publications:</b> ' + n.value + '</div>' : '');
+                     (n.value ? '<div class="info-line"><b>Publications:</b> ' + n.value + '</div>' : '') +
+                     __clusterLine(n) + __egoLine(n);
           info.innerHTML = html;
         } else if (n && n.kind === 'pub') {
           var authors = (n.authors && n.authors.length) ? n.authors.join(', ') : '—';
@@ -142,7 +223,7 @@ window.IM_initUI = function() {
                      '<div class="info-line"><b>Type:</b> ' + (n.ptype || '—') + '</div>' +
                      '<div class="info-line"><b>Project Year:</b> ' + (n.year || '—') + '</div>' +
                      '<div class="info-line"><b>Authors:</b> ' + authors + '</div>' +
-                     doiLine;
+                     doiLine + __clusterLine(n);
           info.innerHTML = html;
         }
       }
@@ -229,11 +310,23 @@ window.IM_initUI = function() {
       try {
         var sel = document.getElementById('people_select'); if(!sel) return;
         sel.innerHTML = '';
+        // with a search index, Tom Select gets the people as plain option data instead
+        if (window.AP_SEARCH && typeof TomSelect !== 'undefined') return;
         var arr = (window.AP_PEOPLE || []).slice().sort(function(a,b){ var an=(a.name||'').toLowerCase(); var bn=(b.name||'').toLowerCase(); return an<bn?-1:an>bn?1:0; });
         arr.forEach(function(p){ var opt=document.createElement('option'); opt.value = p.id; opt.textContent = p.name || ("person:"+p.id); sel.appendChild(opt); });
       } catch(e) { console && console.warn && console.warn('people_populate failed', e); }
     }
-    function people_upgradeTomSelect(){ try{ var el=document.getElementById('people_select'); if(!el) return; if(window.__people_ts__){ try{ window.__people_ts__.destroy(); }catch(e){} window.__people_ts__=null; } if(typeof TomSelect !== 'undefined'){ window.__people_ts__ = new TomSelect(el, { maxItems: null, plugins: ['remove_button'], create: false, persist: false, sortField: { field: 'text', direction: 'asc' } }); } }catch(e){}
+    function people_upgradeTomSelect(){ try{ var el=document.getElementById('people_select'); if(!el) return; if(window.__people_ts__){ try{ window.__people_ts__.destroy(); }catch(e){} window.__people_ts__=null; } if(typeof TomSelect !== 'undefined'){ var tsOpts = { maxItems: null, plugins: ['remove_button'], create: false, persist: false, sortField: { field: 'text', direction: 'asc' } }; if (window.AP_SEARCH) { tsOpts.options = (window.AP_PEOPLE || []).map(function(p){ return { value: String(p.id), text: p.name || ('person:'+p.id) }; }); tsOpts.score = people_indexScore; } window.__people_ts__ = new TomSelect(el, tsOpts); } }catch(e){}
+    }
+    // Tom Select score hook: answer the query from the search index once, then
+    // each option is a constant-time lookup instead of a fuzzy string match.
+    function people_indexScore(query){
+      var hits = {};
+      // the selector's own index (it lists people that are not drawn); no
+      // limit: every listed person matching the query must stay selectable
+      var idx = window.AP_SEARCH && window.AP_SEARCH.people;
+      window.IM_search(query, { kind: 'person', limit: Infinity, index: idx }).forEach(function(h){ hits[h.id.slice('person:'.length)] = 1; });
+      return function(item){ return hits[item.value] ? 1 : 0; };
     }
     function people_getSelected(){ try{ var sel=document.getElementById('people_select'); if(!sel) return []; var out=[]; for(var i=0;i<sel.options.length;i++){ var o=sel.options[i]; if(o.selected) out.push(o.value); } return out; } catch(e){ return []; } }
     // Relayout visible nodes in a compact circle: publications on outer ring,
@@ -386,11 +479,86 @@ window.IM_initUI = function() {
         try { network.setOptions({ physics: prevPhysics }); } catch(e){}
       } catch(e) { console && console.warn && console.warn('relayoutPeopleSpread error', e); }
     }
+    // Positions written by the Python build are already overlap-free, so the
+    // unfiltered view restores them instead of running a relayout.
+    var __basePositions = {};
+    nodes.get().forEach(function(n){ if (typeof n.x === 'number' && typeof n.y === 'number') __basePositions[n.id] = { x: n.x, y: n.y }; });
+    function __restoreBaseLayout(){
+      try {
+        var ups = [];
+        nodes.get().forEach(function(n){
+          var p = __basePositions[n.id];
+          if (p && (n.x !== p.x || n.y !== p.y)) ups.push({ id: n.id, x: p.x, y: p.y, fixed: { x: true, y: true } });
+        });
+        if (ups.length) nodes.update(ups);
+        try { network.fit({ padding: 16 }); } catch(e){ try{ network.fit(); }catch(e){} }
+      } catch(e) { console && console.warn && console.warn('restoreBaseLayout error', e); }
+    }
+    // Subteam / PI-only views are laid out by the Python build too
+    // (visualization/filter_views.py, window.AP_VIEW_POSITIONS). Returns null
+    // when this view was not precomputed or a visible node has no position.
+    function __viewPositions(sels, piOnly){
+      var views = window.AP_VIEW_POSITIONS || {};
+      var pos = views[sels.slice().sort().join(',') + (piOnly ? '|pi' : '')];
+      if (!pos) return null;
+      var visible = nodes.get({ filter: function(n){ return !n.hidden && (n.kind === 'person' || n.kind === 'pub'); } });
+      for (var i = 0; i < visible.length; i++) if (!pos[visible[i].id]) return null;
+      return pos;
+    }
+    function __applyViewPositions(pos){
+      try {
+        var ups = [];
+        nodes.get({ filter: function(n){ return !n.hidden && !!pos[n.id]; } }).forEach(function(n){
+          var p = pos[n.id];
+          if (n.x !== p[0] || n.y !== p[1]) ups.push({ id: n.id, x: p[0], y: p[1], fixed: { x: true, y: true } });
+        });
+        if (ups.length) nodes.update(ups);
+        try { network.fit({ padding: 16 }); } catch(e){ try{ network.fit(); }catch(e){} }
+      } catch(e) { console && console.warn && console.warn('applyViewPositions error', e); }
+    }
+    // Edge bundles (visualization/bundling.py): while collapsed, weighted bundle
+    // edges stand in for their member edges, which are hidden and tagged
+    // `bundled`. Members show when zoomed in past window.AP_BUNDLE_ZOOM or when
+    // filters are active; a selected node always shows its own edges.
+    var __bundleMode = edges.get({ filter: function(e){ return e.kind === 'bundle'; } }).length > 0;
+    var __bundleState = { zoomed: false, filtered: false, focus: {} };
+    function __bundleExpanded(){ return __bundleState.zoomed || __bundleState.filtered; }
+    function __edgeHidden(e, na, nb){
+      if (e.kind === 'bundle') return __bundleExpanded();
+      if ((na && na.hidden) || (nb && nb.hidden)) return true;
+      if (e.bundled !== undefined && !__bundleExpanded()) return !__bundleState.focus[e.id];
+      return false;
+    }
+    function __bundleRefresh(){
+      if (!__bundleMode) return;
+      var ups = [];
+      edges.get({ filter: function(e){ return e.kind === 'bundle' || e.bundled !== undefined; } }).forEach(function(e){
+        var hide = __edgeHidden(e, nodes.get(e.from), nodes.get(e.to));
+        if (!!e.hidden !== hide) ups.push({ id: e.id, hidden: hide });
+      });
+      if (ups.length) edges.update(ups);
+    }
+    function __bundleFocus(nodeId){
+      if (!__bundleMode) return;
+      __bundleState.focus = {};
+      if (nodeId) ((network.getConnectedEdges && network.getConnectedEdges(nodeId)) || []).forEach(function(id){ __bundleState.focus[id] = true; });
+      __bundleRefresh();
+    }
+    if (__bundleMode) {
+      var __bundleZoom = (typeof window.AP_BUNDLE_ZOOM === 'number') ? window.AP_BUNDLE_ZOOM : 0.8;
+      network.on('zoom', function(){
+        var zoomed = network.getScale() >= __bundleZoom;
+        if (zoomed !== __bundleState.zoomed) { __bundleState.zoomed = zoomed; __bundleRefresh(); }
+      });
+    }
     function __flt_apply(){
       try {
         var sels = __flt_selectedSubteams(); var selSet = {}; sels.forEach(function(s){ selSet[s] = true; });
         var piOnly = (document.getElementById('flt_pis')||{}).checked;
         var selectedPeople = people_getSelected(); // array of pid strings
+        var showingAll = (sels.length===0 || sels.length===3) && !piOnly && !(selectedPeople && selectedPeople.length);
+        // bundles only summarize the full map; filtered views show individual edges
+        __bundleState.filtered = !showingAll;
         var selectedSet = {}; selectedPeople.forEach(function(id){ selectedSet['person:'+id] = true; });
         var visiblePersons = {}; var updates = []; var allNodes = nodes.get();
         allNodes.forEach(function(n){
@@ -432,8 +600,10 @@ window.IM_initUI = function() {
           }
         });
         nodes.update(updates);
-        var eUpdates = []; edgesArr.forEach(function(e){ var na=nodes.get(e.from), nb=nodes.get(e.to); var hide=(na&&na.hidden)||(nb&&nb.hidden); eUpdates.push({ id:e.id, hidden: hide }); });
-        edges.update(eUpdates);
+        // push only edges whose visibility changes
+        var edgeHidden = {};
+        var eUpdates = []; edgesArr.forEach(function(e){ var na=nodes.get(e.from), nb=nodes.get(e.to); var hide=__edgeHidden(e, na, nb); edgeHidden[e.id] = hide; if (!!e.hidden !== hide) eUpdates.push({ id:e.id, hidden: hide }); });
+        if (eUpdates.length) edges.update(eUpdates);
         __recomputeSizesFromVisible();
         // Hide people who have no visible publications (after applying filters).
         try {
@@ -450,14 +620,20 @@ window.IM_initUI = function() {
           if (personUpdates.length) nodes.update(personUpdates);
           // Recompute edge visibility after hiding persons
           var eUpdates2 = [];
-          edgesArr.forEach(function(e){ var na2 = nodes.get(e.from), nb2 = nodes.get(e.to); var hide2 = (na2 && na2.hidden) || (nb2 && nb2.hidden); eUpdates2.push({ id: e.id, hidden: hide2 }); });
+          edgesArr.forEach(function(e){ var na2 = nodes.get(e.from), nb2 = nodes.get(e.to); var hide2 = __edgeHidden(e, na2, nb2); if (edgeHidden[e.id] !== hide2) eUpdates2.push({ id: e.id, hidden: hide2 }); });
           if (eUpdates2.length) edges.update(eUpdates2);
         } catch(e){}
-        // After filtering, if subteam filters are active run a compact circular relayout
-        // (publications on outer ring, people on inner ring). Otherwise just fit.
+        // After filtering, use the layout the build computed for this view; only
+        // a selection of specific people (or a page without precomputed views)
+        // falls back to a compact circular relayout in the browser.
         var selsActive = (sels.length>0);
+        var viewPos = (selectedPeople && selectedPeople.length) ? null : __viewPositions(sels, piOnly);
         try {
-          if (selsActive) {
+          if (showingAll) {
+            __restoreBaseLayout();
+          } else if (viewPos) {
+            __applyViewPositions(viewPos);
+          } else if (selsActive) {
             // If filtering includes 'discover', use a larger spacing so nodes spread out more
             try {
               var useDiscoverSpacing = (sels.indexOf('discover') !== -1);
@@ -485,18 +661,15 @@ window.IM_initUI = function() {
           var allE = edges.get();
           var upd = [];
           allE.forEach(function(e){
-            // keep existing hidden state if present
-            var hid = !!e.hidden;
             // if the edge already has a color/width, leave it; otherwise set defaults
             var needsColor = !(e.color || (e.color && e.color.color));
             var needsWidth = (typeof e.width === 'undefined');
+            // only push updates if we will change something (partial updates keep `hidden`)
+            if (!needsColor && !needsWidth) return;
             var obj = { id: e.id };
             if (needsColor) obj.color = { color: '#666666' };
             if (needsWidth) obj.width = 1;
-            // preserve hidden flag if it exists
-            if (hid) obj.hidden = true;
-            // only push updates if we will change something
-            if (needsColor || needsWidth || hid) upd.push(obj);
+            upd.push(obj);
           });
           if (upd.length) edges.update(upd);
         } catch(e) { console && console.warn && console.warn('ensureEdgeStyling failed', e); }
@@ -511,6 +684,118 @@ window.IM_initUI = function() {
   try { var fltApplyBtn = document.getElementById('flt_apply'); if (fltApplyBtn) fltApplyBtn.onclick = __flt_apply; } catch(e){}
   try { __flt_apply(); } catch(e){}
 
+    // 6b) Typeahead search over the index prebuilt by visualization/search_index.py
+    // (window.AP_SEARCH, or fetched from window.AP_SEARCH_URL). Queries never
+    // scan all nodes: 1-2 char terms read the token-prefix table, longer terms
+    // intersect trigram postings and verify the few candidates left.
+    function __search_normalize(s){
+      s = (s == null) ? '' : String(s);
+      try { s = s.normalize('NFKD').replace(/[\u0300-\u036f]/g, ''); } catch(e){}
+      return s.toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+    }
+    function __search_intersect(a, b){
+      var out = [], i = 0, j = 0;
+      while (i < a.length && j < b.length){
+        if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+        else if (a[i] < b[j]) i++; else j++;
+      }
+      return out;
+    }
+    function __search_term(idx, term){
+      if (term.length < 3) return idx.pre[term] || [];
+      var cand = null;
+      for (var i = 0; i + 3 <= term.length; i++){
+        var post = idx.tri[term.substr(i, 3)];
+        if (!post) return [];
+        cand = (cand === null) ? post : __search_intersect(cand, post);
+        if (!cand.length) return [];
+      }
+      // all trigrams present can still come from different tokens: verify
+      if (term.length > 3) cand = cand.filter(function(d){ return idx.text[d].indexOf(term) !== -1; });
+      return cand;
+    }
+    // Returns [{id, kind, label}] for a free-text query; opts: { kind, limit, index }
+    window.IM_search = function(query, opts){
+      var idx = (opts && opts.index) || window.AP_SEARCH; if (!idx) return [];
+      var limit = (opts && opts.limit) || 20, kind = opts && opts.kind;
+      var terms = __search_normalize(query).split(' ').filter(function(t){ return t.length; });
+      if (!terms.length) return [];
+      // intersect starting from the rarest term
+      var lists = terms.map(function(t){ return __search_term(idx, t); }).sort(function(a, b){ return a.length - b.length; });
+      var hits = lists[0];
+      for (var li = 1; li < lists.length && hits.length; li++) hits = __search_intersect(hits, lists[li]);
+      var out = [];
+      for (var k = 0; k < hits.length && out.length < limit; k++){
+        var d = idx.docs[hits[k]];
+        if (kind && d[1] !== kind) continue;
+        out.push({ id: d[0], kind: d[1], label: d[2] });
+      }
+      return out;
+    };
+    function __search_focus(nodeId){
+      if (!nodes.get(nodeId)) return;
+      try { network.selectNodes([nodeId]); } catch(e){}
+      try { network.focus(nodeId, { scale: 1.2, animation: { duration: 400, easing: 'easeInOutQuad' } }); } catch(e){}
+      try { __handleClick({ nodes: [nodeId] }); } catch(e){}
+    }
+    (function __search_bind(){
+      var input = document.getElementById('im_search');
+      var box = document.getElementById('im_search_results');
+      if (!input || !box) return;
+      if (!window.AP_SEARCH && window.AP_SEARCH_URL && window.fetch) {
+        fetch(window.AP_SEARCH_URL).then(function(r){ return r.json(); })
+          .then(function(idx){ window.AP_SEARCH = idx; })
+          .catch(function(e){
+            var hint = (location.protocol === 'file:') ? ' (pages opened from file:// cannot fetch it; serve the folder over http)' : '';
+            console && console.warn && console.warn('search index load failed' + hint, e);
+          });
+      }
+      function close(){ box.classList.remove('open'); }
+      input.addEventListener('input', function(){
+        var hits = window.IM_search(input.value, { limit: 30 });
+        box.innerHTML = '';
+        hits.forEach(function(h){
+          var el = document.createElement('div'); el.className = 'hit'; el.title = h.label;
+          var k = document.createElement('span'); k.className = 'kind'; k.textContent = (h.kind === 'person') ? 'Person' : 'Pub';
+          el.appendChild(k); el.appendChild(document.createTextNode(h.label));
+          el.onclick = function(){ __search_focus(h.id); close(); };
+          box.appendChild(el);
+        });
+        if (hits.length) box.classList.add('open'); else close();
+      });
+      input.addEventListener('keydown', function(ev){
+        if (ev.key === 'Enter') { var first = window.IM_search(input.value, { limit: 1 })[0]; if (first) { __search_focus(first.id); close(); } }
+        else if (ev.key === 'Escape') { close(); }
+      });
+    })();
+
+    // 6c) Deltas: keep the cached layout positions in step with IM_patchGraph
+    window.IM_applyDelta = function(delta){
+      if (!window.IM_patchGraph(delta)) return false;
+      var nd = delta.nodes || {};
+      (nd.remove || []).forEach(function(id){ delete __basePositions[id]; });
+      (nd.add || []).concat(nd.update || []).forEach(function(n){ if (typeof n.x === 'number' && typeof n.y === 'number') __basePositions[n.id] = { x: n.x, y: n.y }; });
+      return true;
+    };
+
+    // 6d) Dev server (visualize_pyvis.py --watch): apply pushed graph deltas and
+    // search index, swap the stylesheet on CSS edits, reload on JS edits.
+    (function __dev_bind(){
+      var url = window.AP_DEV_EVENTS;
+      if (!url || !window.EventSource) return;
+      var es = new EventSource(url);
+      es.addEventListener('delta', function(ev){
+        // a missed delta leaves the versions out of step: fall back to a reload
+        if (window.IM_applyDelta(JSON.parse(ev.data))) __flt_apply(); else window.location.reload();
+      });
+      es.addEventListener('search', function(ev){ window.AP_SEARCH = JSON.parse(ev.data); });
+      es.addEventListener('css', function(){
+        var links = document.querySelectorAll('link[rel="stylesheet"][href*="assets/vis_styles.css"]');
+        for (var i = 0; i < links.length; i++) links[i].href = links[i].href.split('?')[0] + '?v=' + Date.now();
+      });
+      es.addEventListener('reload', function(){ window.location.reload(); });
+    })();
+
     // 7) Add Publication helpers (Tom Select, preview, generate)
     function ap_populateAuthors() {
       var sel = document.getElementById('ap_authors_sel'); if (!sel) return; sel.innerHTML='';
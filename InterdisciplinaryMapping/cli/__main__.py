@@ -0,0 +1,7 @@
+"""Entry point: `python -m cli {export,build,render,query} ...`."""
+import sys
+
+from cli.commands import main
+
+if __name__ == "__main__":
+    sys.exit(main())
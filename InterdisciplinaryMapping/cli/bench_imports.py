@@ -0,0 +1,74 @@
+"""Startup benchmark for the command line entry points.
+
+    python -m cli.bench_imports [--runs 7] [--budget-ms 200]
+
+Each case runs in a fresh interpreter. A case fails when it imports one of
+HEAVY_MODULES (checked with `-X importtime`, so it does not depend on machine
+speed) or when its best wall time exceeds the budget. Exits 1 on any failure
+so it can guard CI or a pre-commit hook against import-time regressions.
+"""
+from pathlib import Path
+import argparse
+import subprocess
+import sys
+import time
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that only the render path may load
+HEAVY_MODULES = ("pandas", "numpy", "pyvis", "jinja2", "networkx", "IPython")
+
+# (name, interpreter arguments)
+CASES = [
+    ("cli --help", ["-m", "cli", "--help"]),
+    ("cli render --help", ["-m", "cli", "render", "--help"]),
+    ("cli build", ["-m", "cli", "build"]),
+    ("cli query", ["-m", "cli", "query", "person:1", "--json"]),
+    ("visualize_pyvis.py --help", ["visualize_pyvis.py", "--help"]),
+    ("import app", ["-c", "import app"]),
+    ("import exporter", ["-c", "import runpy; runpy.run_path('data/other/export_csv.py')"]),
+]
+
+
+def _run(args, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - started, proc
+
+
+def heavy_imports(args) -> list:
+    """Top-level packages from HEAVY_MODULES that the command imports."""
+    _, proc = _run(args, importtime=True)
+    found = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        name = line.rsplit("|", 1)[-1].strip().split(".")[0]
+        if name in HEAVY_MODULES:
+            found.add(name)
+    return sorted(found)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="runs per case; the best time is reported")
+    parser.add_argument("--budget-ms", type=float, default=200.0, help="max best wall time per case")
+    args = parser.parse_args(argv)
+
+    baseline = min(_run(["-c", "pass"])[0] for _ in range(args.runs))
+    print(f"{'case':32} {'best ms':>8} {'-python':>8}  heavy imports")
+    failed = 0
+    for name, case_args in CASES:
+        best = min(_run(case_args)[0] for _ in range(args.runs))
+        heavy = heavy_imports(case_args)
+        ok = not heavy and best * 1000 <= args.budget_ms
+        failed += not ok
+        print(f"{name:32} {best * 1000:8.1f} {(best - baseline) * 1000:8.1f}  "
+              f"{', '.join(heavy) or '-'}{'' if ok else '   FAIL'}")
+    print(f"(bare interpreter: {baseline * 1000:.1f} ms, budget {args.budget_ms:.0f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
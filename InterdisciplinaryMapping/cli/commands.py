@@ -0,0 +1,142 @@
+"""Subcommands of `python -m cli`.
+
+Only argparse and src.filters are imported up front; each command imports
+what it needs when it runs, so `--help`, `build` and `query` never load
+pandas, numpy or pyvis.
+"""
+from pathlib import Path
+import argparse
+import json
+import sys
+
+from src.filters import ViewFilter, add_view_arguments
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PERSONNEL = BASE_DIR / "data" / "personnel.ndjson"
+PUBLICATIONS = BASE_DIR / "data" / "publications.ndjson"
+
+
+def _build(args, view):
+    """(graph, builder, reports) from the NDJSON files or the --db store."""
+    from src.builder import GraphBuilder
+
+    if args.db:
+        from src.store import SQLiteGraphStore, SQLitePersonnelSource, SQLitePublicationSource
+        with SQLiteGraphStore(args.db) as store:
+            store.import_ndjson(str(PERSONNEL), str(PUBLICATIONS))
+            builder = GraphBuilder(SQLitePersonnelSource(store, view), SQLitePublicationSource(store, view), view)
+            graph = builder.build()
+            return graph, builder, store.reports
+    from src.sources import NDJSONPersonnelSource, NDJSONPublicationSource
+    personnel_source = NDJSONPersonnelSource(str(PERSONNEL), view)
+    publication_source = NDJSONPublicationSource(str(PUBLICATIONS), view)
+    builder = GraphBuilder(personnel_source, publication_source, view)
+    graph = builder.build()
+    return graph, builder, (personnel_source.report, publication_source.report)
+
+
+def cmd_export(args, view) -> int:
+    from visualize_pyvis import load_exporter
+    load_exporter(BASE_DIR).export_to_csv(args.db, args.people, args.pubs, view)
+    return 0
+
+
+def cmd_build(args, view) -> int:
+    graph, builder, reports = _build(args, view)
+    for report in reports:
+        print(report)
+    edges = sum(len(graph.neighbors(n)) for n in graph.nodes()) // 2
+    people = sum(1 for n in graph.nodes() if n.startswith("person:"))
+    print(f"Graph: {len(graph.nodes())} nodes ({people} people, {len(graph.nodes()) - people} publications), {edges} edges")
+    return 0
+
+
+def cmd_render(rest) -> int:
+    from visualize_pyvis import main as visualize_main
+    visualize_main(rest)
+    return 0
+
+
+def _resolve(term: str, graph, labels: dict) -> list:
+    """Node ids for "person:<id>", "pub:<id>", or a case-insensitive name/title substring."""
+    if term in labels or graph.neighbors(term):
+        return [term]
+    needle = term.strip().lower()
+    return sorted(n for n, label in labels.items() if needle in label.lower())
+
+
+def cmd_query(args, view) -> int:
+    graph, builder, _ = _build(args, view)
+    labels = {f"person:{p.id}": p.name or p.id for p in builder.people}
+    labels.update({f"pub:{p.id}": p.short_title or p.title or p.id for p in builder.publications})
+
+    matches = _resolve(args.node, graph, labels)
+    if not matches:
+        print(f"No node matches {args.node!r}", file=sys.stderr)
+        return 1
+
+    results = []
+    for start in matches[:args.limit]:
+        seen = {start}
+        frontier = [start]
+        hops = []
+        for _ in range(args.hops):
+            nxt = sorted({m for n in frontier for m in graph.neighbors(n)} - seen)
+            seen.update(nxt)
+            hops.append(nxt)
+            frontier = nxt
+        results.append({
+            "id": start,
+            "label": labels.get(start, start),
+            "hops": [[{"id": n, "label": labels.get(n, n)} for n in level] for level in hops],
+        })
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return 0
+    for r in results:
+        print(f"{r['id']}  {r['label']}")
+        for depth, level in enumerate(r["hops"], 1):
+            for n in level:
+                print(f"{'  ' * depth}{n['id']}  {n['label']}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Interdisciplinary Mapping tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="write data/nodes.csv and data/edges.csv")
+    p.add_argument("--db", help="SQLite store to import the NDJSON into and export from")
+    p.add_argument("--people", action="append", metavar="PATH_OR_URL",
+                   help="personnel NDJSON shard or http(s) URL (repeatable; default data/personnel.ndjson)")
+    p.add_argument("--pubs", action="append", metavar="PATH_OR_URL",
+                   help="publications NDJSON shard or http(s) URL (repeatable; default data/publications.ndjson)")
+    add_view_arguments(p)
+
+    p = sub.add_parser("build", help="build the graph and print ingest reports and counts")
+    p.add_argument("--db", help="SQLite store to read records from")
+    add_view_arguments(p)
+
+    # options are forwarded untouched to visualize_pyvis.py (see `render --help`)
+    sub.add_parser("render", add_help=False, help="render graph.html (same options as visualize_pyvis.py)")
+
+    p = sub.add_parser("query", help="show a node and its neighborhood")
+    p.add_argument("node", help='node id ("person:12", "pub:3") or part of a name/title')
+    p.add_argument("--hops", type=int, default=1, help="neighborhood depth (default 1)")
+    p.add_argument("--limit", type=int, default=10, help="max matching nodes to show")
+    p.add_argument("--json", action="store_true", help="print JSON instead of text")
+    p.add_argument("--db", help="SQLite store to read records from")
+    add_view_arguments(p)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "render":
+        return cmd_render(rest)
+    if rest:
+        parser.error("unrecognized arguments: " + " ".join(rest))
+    view = ViewFilter.from_args(args)
+    return {"export": cmd_export, "build": cmd_build, "query": cmd_query}[args.command](args, view)
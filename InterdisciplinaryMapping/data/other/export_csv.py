@@ -5,6 +5,7 @@ which are in the parent `data/` directory and so imports from `src` work.
 """
 
 from pathlib import Path
+import argparse
 import csv
 import json
 from typing import Dict, List, Tuple
@@ -14,8 +15,10 @@ import sys
 # in data/other. parents[2] -> repo root for data/other/export_csv.py
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from src.builder import GraphBuilder
-from src.sources import NDJSONPersonnelSource, NDJSONPublicationSource
+from src.builder import AuthorLinker, ConcurrentGraphBuilder, GraphBuilder, author_keys, authored_any
+from src.filters import ViewFilter, add_view_arguments
+from src.models import normalize_id
+from src.sources import NDJSONPersonnelSource, NDJSONPublicationSource, personnel_source_for, publication_source_for
 
 
 BASE = Path(__file__).resolve().parent
@@ -46,7 +49,7 @@ def build_people_maps(person_records: List[dict]) -> Tuple[Dict[str, str], Dict[
     label_map: Dict[str, str] = {}
     pi_map: Dict[str, bool] = {}
     for rec in person_records:
-        pid = str(rec.get("id", "")).strip()
+        pid = normalize_id(rec.get("id"))
         if not pid:
             continue
         node = f"person:{pid}"
@@ -61,7 +64,7 @@ def build_publication_maps(pub_records: List[dict], pi_map: Dict[str, bool]) ->
     label_map: Dict[str, str] = {}
     pi_counts: Dict[str, int] = {}
     for rec in pub_records:
-        pub_id = str(rec.get("id", "")).strip()
+        pub_id = normalize_id(rec.get("id"))
         if not pub_id:
             continue
         node = f"pub:{pub_id}"
@@ -70,7 +73,7 @@ def build_publication_maps(pub_records: List[dict], pi_map: Dict[str, bool]) ->
         label = short.strip() if short.strip() else str(title)
         label_map[node] = label
 
-        authors = [str(a) for a in rec.get("authors", [])]
+        authors = [normalize_id(a) for a in rec.get("authors", [])]
         count = 0
         for a in authors:
             if pi_map.get(f"person:{a}"):
@@ -88,7 +91,7 @@ def write_nodes_csv(path: Path, person_records: List[dict], pub_records: List[di
 
         # people first (from NDJSON so we include any person even with zero pubs)
         for rec in person_records:
-            pid = str(rec.get("id", "")).strip()
+            pid = normalize_id(rec.get("id"))
             if not pid:
                 continue
             node = f"person:{pid}"
@@ -98,7 +101,7 @@ def write_nodes_csv(path: Path, person_records: List[dict], pub_records: List[di
 
         # publications
         for rec in pub_records:
-            pub_id = str(rec.get("id", "")).strip()
+            pub_id = normalize_id(rec.get("id"))
             if not pub_id:
                 continue
             node = f"pub:{pub_id}"
@@ -123,26 +126,118 @@ def write_edges_csv(path: Path, graph) -> None:
                 writer.writerow([pair[0], pair[1]])
 
 
-def export_to_csv() -> None:
+def write_store_csv(store, view: ViewFilter, nodes_path: Path, edges_path: Path) -> None:
+    """Stream the store's rows straight into nodes.csv and edges.csv.
+
+    Links authors with the builder's AuthorLinker / authored_any, so the rows
+    match building the graph from SQLite sources, but only the author index
+    and the PI ids are kept in memory, never the records themselves.
+    """
+    from src.store import SQLitePersonnelSource, SQLitePublicationSource
+
+    publications = SQLitePublicationSource(store, view)
+    keys = None
+    if view is not None and view.has_publications:
+        keys = author_keys(publications.iter_publications())
+
+    nodes_path.parent.mkdir(parents=True, exist_ok=True)
+    linker = AuthorLinker(create_missing=not (view is not None and view.restricts_people))
+    pi_ids = set()
+    with nodes_path.open("w", newline="", encoding="utf-8") as nodes_fh, \
+            edges_path.open("w", newline="", encoding="utf-8") as edges_fh:
+        nodes = csv.writer(nodes_fh)
+        edges = csv.writer(edges_fh)
+        nodes.writerow(["id", "label", "kind", "PI", "pi_count"])
+        edges.writerow(["source", "target"])
+
+        for person in SQLitePersonnelSource(store, view).iter_people():
+            if keys is not None and not authored_any(person, keys):
+                continue
+            node = linker.add_person(person)
+            if person.PI:
+                pi_ids.add(person.id)
+            nodes.writerow([node, person.name or person.id, "person", "true" if person.PI else "false", ""])
+
+        for pub in publications.iter_publications():
+            node = f"pub:{pub.id}"
+            label = pub.short_title.strip() or pub.title or pub.id
+            nodes.writerow([node, label, "pub", "", str(sum(1 for a in pub.authors if a in pi_ids))])
+            for person_node in linker.person_nodes(pub.authors):
+                edges.writerow([person_node, node])
+
+
+def export_to_csv(db_path: str = None, people_specs: List[str] = None, pub_specs: List[str] = None,
+                  view: ViewFilter = None) -> None:
+    """Write nodes.csv / edges.csv. `view` is pushed down so excluded records are never loaded."""
+    view = view or None
     # Prepare sources and build graph
     personnel_path = DATA_DIR / "personnel.ndjson"
     publications_path = DATA_DIR / "publications.ndjson"
 
-    personnel_source = NDJSONPersonnelSource(str(personnel_path))
-    publication_source = NDJSONPublicationSource(str(publications_path))
-    builder = GraphBuilder(personnel_source, publication_source)
-    graph = builder.build()
+    nodes_path = DATA_DIR / "nodes.csv"
+    edges_path = DATA_DIR / "edges.csv"
+
+    store = None
+    if db_path:
+        from src.store import SQLiteGraphStore, SQLitePersonnelSource, SQLitePublicationSource
+
+        # Import NDJSON into the SQLite store (only when it changed) and read
+        # back only the rows in view through indexed queries.
+        store = SQLiteGraphStore(str(db_path))
+        store.import_ndjson(str(personnel_path), str(publications_path))
 
-    # Load NDJSON records (include all persons/pubs)
-    person_records = load_ndjson(personnel_path)
-    pub_records = load_ndjson(publications_path)
+    if store is not None and not (people_specs or pub_specs):
+        with store:
+            write_store_csv(store, view, nodes_path, edges_path)
+            reports = store.reports
+        for report in reports:
+            if not report.ok or report.filtered:
+                print(report)
+        print(" ", nodes_path)
+        print(" ", edges_path)
+        return
+
+    if people_specs or pub_specs:
+        # Several shards / services: read them all concurrently and merge by id.
+        personnel_sources = [personnel_source_for(s, view) for s in (people_specs or [])]
+        publication_sources = [publication_source_for(s, view) for s in (pub_specs or [])]
+        if store is not None:
+            personnel_sources.insert(0, SQLitePersonnelSource(store, view))
+            publication_sources.insert(0, SQLitePublicationSource(store, view))
+        # A side without shards reads the default NDJSON instead of being empty
+        if not personnel_sources:
+            personnel_sources.append(NDJSONPersonnelSource(str(personnel_path), view))
+        if not publication_sources:
+            publication_sources.append(NDJSONPublicationSource(str(publications_path), view))
+        builder = ConcurrentGraphBuilder(personnel_sources, publication_sources, view=view)
+        graph = builder.build()
+        reports = [getattr(src, "report", None) for src in personnel_sources + publication_sources]
+        if any(builder.duplicates.values()):
+            print("Merged duplicates:", builder.duplicates)
+        person_records = [p.to_record() for p in builder.people]
+        pub_records = [p.to_record() for p in builder.publications]
+    else:
+        personnel_source = NDJSONPersonnelSource(str(personnel_path), view)
+        publication_source = NDJSONPublicationSource(str(publications_path), view)
+        builder = GraphBuilder(personnel_source, publication_source, view)
+        graph = builder.build()
+        reports = (personnel_source.report, publication_source.report)
+        if view is not None:
+            person_records = [p.to_record() for p in builder.people]
+            pub_records = [p.to_record() for p in builder.publications]
+        else:
+            # Load NDJSON records (include all persons/pubs)
+            person_records = load_ndjson(personnel_path)
+            pub_records = load_ndjson(publications_path)
+    if store is not None:
+        store.close()
+    for report in reports:
+        if report is not None and (not report.ok or report.filtered):
+            print(report)
 
     people_map, pi_map = build_people_maps(person_records)
     pub_map, pub_pi_counts = build_publication_maps(pub_records, pi_map)
 
-    nodes_path = DATA_DIR / "nodes.csv"
-    edges_path = DATA_DIR / "edges.csv"
-
     write_nodes_csv(nodes_path, person_records, pub_records, people_map, pub_map, pub_pi_counts)
     write_edges_csv(edges_path, graph)
 
@@ -151,4 +246,12 @@ def export_to_csv() -> None:
 
 
 if __name__ == "__main__":
-    export_to_csv()
+    parser = argparse.ArgumentParser(description="Export the graph to data/nodes.csv and data/edges.csv.")
+    parser.add_argument("--db", help="SQLite store to import the NDJSON into and export from")
+    parser.add_argument("--people", action="append", metavar="PATH_OR_URL",
+                        help="personnel NDJSON shard or http(s) URL (repeatable; default data/personnel.ndjson)")
+    parser.add_argument("--pubs", action="append", metavar="PATH_OR_URL",
+                        help="publications NDJSON shard or http(s) URL (repeatable; default data/publications.ndjson)")
+    add_view_arguments(parser)
+    args = parser.parse_args()
+    export_to_csv(args.db, args.people, args.pubs, ViewFilter.from_args(args))
@@ -1,38 +1,173 @@
 from .graph import Graph
 
+
+class AuthorLinker:
+    """Resolve publication author ids to person nodes, by id and then by lowercase name.
+
+    Shared by graph building and the streaming CSV export so both link the
+    same way. With create_missing=False (a view that filters people) unknown
+    authors are people the view excludes and get no node.
+    """
+
+    def __init__(self, create_missing: bool = True):
+        self.create_missing = create_missing
+        self.id_to_node = {}
+        self.name_to_node = {}
+
+    def add_person(self, person) -> str:
+        """Index `person`; returns its node id."""
+        person_node = f"person:{person.id}"
+        self.id_to_node[person.id] = person_node
+        if person.name:
+            self.name_to_node[person.name.strip().lower()] = person_node
+        return person_node
+
+    def person_nodes(self, authors):
+        """Yield the person node of each author once, in author order."""
+        linked = set()
+        for author in authors:
+            # author ids are normalized at ingest, so this is the common path
+            person_node = self.id_to_node.get(author) or self.name_to_node.get(author.lower())
+            if not person_node:
+                if not self.create_missing:
+                    continue
+                person_node = f"person:{author}"
+            if person_node not in linked:
+                linked.add(person_node)
+                yield person_node
+
+
+def author_keys(pubs) -> set:
+    """Author ids of `pubs`, as given and lowercased (what authored_any matches people against)."""
+    keys = set()
+    for pub in pubs:
+        for author in pub.authors:
+            keys.add(author)
+            keys.add(author.lower())
+    return keys
+
+
+def authored_any(person, keys: set) -> bool:
+    """Whether `person` is one of the authors in `keys` (by id or name, like AuthorLinker)."""
+    return person.id in keys or bool(person.name and person.name.strip().lower() in keys)
+
+
+def _with_publications(people, pubs):
+    """People who author at least one of `pubs`."""
+    keys = author_keys(pubs)
+    return [p for p in people if authored_any(p, keys)]
+
+
+def _assemble(people, pubs, view=None) -> Graph:
+    g = Graph()
+    linker = AuthorLinker(create_missing=not (view and view.restricts_people))
+    for p in people:
+        g.add_node(linker.add_person(p))
+
+    for pub in pubs:
+        pub_node = f"pub:{pub.id}"
+        g.add_node(pub_node)
+        for person_node in linker.person_nodes(pub.authors):
+            g.add_edge(person_node, pub_node)
+
+    return g
+
+
 class GraphBuilder:
-    def __init__(self, personnel_source, publication_source):
+    """Build the person/publication graph from one personnel and one publication source.
+
+    Record-level filters of `view` (a ViewFilter) belong in the sources, which
+    skip records while parsing; the builder applies the parts that need both
+    sides: `has_publications`, and not inventing nodes for excluded authors.
+    """
+
+    def __init__(self, personnel_source, publication_source, view=None):
         self.personnel_source = personnel_source
         self.publication_source = publication_source
+        self.view = view or None
+        self.people = []
+        self.publications = []
 
     def build(self) -> Graph:
-        g = Graph()
+        pubs = self.publication_source.load_publications()
+        people = self.personnel_source.load_people()
+        if self.view is not None and self.view.has_publications:
+            people = _with_publications(people, pubs)
+        self.people, self.publications = people, pubs
+        return _assemble(people, pubs, self.view)
+
 
-    # index people by id and lowercase name
-        id_to_node = {}
-        name_to_node = {}
+class ConcurrentGraphBuilder:
+    """Merge several personnel and publication sources into one graph.
 
-        for p in self.personnel_source.load_people():
-            person_node = f"person:{p.id}"
-            id_to_node[p.id] = person_node
-            if p.name:
-                name_to_node[p.name.strip().lower()] = person_node
-            g.add_node(person_node)
+    Every source is read concurrently through its async iterator and feeds a
+    bounded queue (so a fast source cannot run far ahead of the consumer).
+    Records are deduplicated by id; the first source listed wins. Author
+    links are resolved once all people are known, so results do not depend
+    on which shard finishes first.
+    """
 
-        for pub in self.publication_source.load_publications():
-            pub_node = f"pub:{pub.id}"
-            g.add_node(pub_node)
+    def __init__(self, personnel_sources, publication_sources, queue_size: int = 1024, view=None):
+        self.personnel_sources = list(personnel_sources)
+        self.publication_sources = list(publication_sources)
+        self.queue_size = queue_size
+        self.view = view or None
+        self.people = []
+        self.publications = []
+        self.duplicates = {"people": 0, "publications": 0}
 
-            for author in pub.authors:
-                person_node = id_to_node.get(author)
+    @staticmethod
+    async def _pump(index: int, aiter, queue: "asyncio.Queue"):
+        async for item in aiter:
+            await queue.put((index, item))
 
-                if not person_node:
-                    person_node = name_to_node.get(author.strip().lower())
+    async def _collect(self, aiters):
+        """Drain all async iterators concurrently; return (items deduplicated by id, duplicate count)."""
+        import asyncio
 
-                if not person_node:
-                    person_node = f"person:{author}"
-                    g.add_node(person_node)
+        queue = asyncio.Queue(maxsize=self.queue_size)
 
-                g.add_edge(person_node, pub_node)
+        async def produce():
+            try:
+                await asyncio.gather(*(self._pump(i, it, queue) for i, it in enumerate(aiters)))
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        per_source = [{} for _ in aiters]
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                break
+            index, item = entry
+            per_source[index].setdefault(item.id, item)
+        # re-raise any source error
+        await producer
+
+        merged = {}
+        dupes = 0
+        for items in per_source:
+            for rid, item in items.items():
+                if rid in merged:
+                    dupes += 1
+                else:
+                    merged[rid] = item
+        return list(merged.values()), dupes
+
+    async def build_async(self) -> Graph:
+        import asyncio
+
+        (people, dup_people), (pubs, dup_pubs) = await asyncio.gather(
+            self._collect([s.aiter_people() for s in self.personnel_sources]),
+            self._collect([s.aiter_publications() for s in self.publication_sources]),
+        )
+        if self.view is not None and self.view.has_publications:
+            people = _with_publications(people, pubs)
+        self.people, self.publications = people, pubs
+        self.duplicates = {"people": dup_people, "publications": dup_pubs}
+        return _assemble(people, pubs, self.view)
+
+    def build(self) -> Graph:
+        import asyncio
 
-        return g
+        return asyncio.run(self.build_async())
@@ -0,0 +1,111 @@
+# diff.py
+"""Compare two versions of the dataset by id.
+
+Records are indexed into dicts keyed by id (a hash join), so a diff is
+O(n) in the number of records and authorship edges.
+"""
+import argparse, json
+from .sources import NDJSONPersonnelSource, NDJSONPublicationSource
+
+
+def diff_records(old, new):
+    """Return (added, removed, modified) for two {id: record dict} maps.
+
+    `modified` holds (id, {field: [old, new]}) for every changed field.
+    """
+    added = [new[k] for k in new if k not in old]
+    removed = [old[k] for k in old if k not in new]
+    modified = []
+    for k, rec in new.items():
+        prev = old.get(k)
+        if prev is None or prev == rec:
+            continue
+        changes = {f: [prev.get(f), rec.get(f)] for f in set(prev) | set(rec) if prev.get(f) != rec.get(f)}
+        modified.append((k, changes))
+    return added, removed, modified
+
+
+def _authorship(pubs):
+    return {(a, p.id) for p in pubs for a in p.authors}
+
+
+class DatasetDiff:
+    def __init__(self, people, publications, authorship_added, authorship_removed):
+        self.people = people                # (added, removed, modified)
+        self.publications = publications    # (added, removed, modified)
+        self.authorship_added = authorship_added
+        self.authorship_removed = authorship_removed
+
+    @property
+    def empty(self) -> bool:
+        return not (any(self.people) or any(self.publications) or self.authorship_added or self.authorship_removed)
+
+    def to_dict(self) -> dict:
+        def _part(part):
+            added, removed, modified = part
+            return {
+                "added": added,
+                "removed": [r["id"] for r in removed],
+                "modified": [{"id": k, "changes": ch} for k, ch in modified],
+            }
+        return {
+            "people": _part(self.people),
+            "publications": _part(self.publications),
+            "authorship": {
+                "added": sorted([a, p] for a, p in self.authorship_added),
+                "removed": sorted([a, p] for a, p in self.authorship_removed),
+            },
+        }
+
+    def summary(self) -> str:
+        lines = []
+        for name, (added, removed, modified) in (("people", self.people), ("publications", self.publications)):
+            lines.append(f"{name}: +{len(added)} -{len(removed)} ~{len(modified)}")
+        lines.append(f"authorship: +{len(self.authorship_added)} -{len(self.authorship_removed)}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+def diff_datasets(old_people, new_people, old_pubs, new_pubs) -> DatasetDiff:
+    """Diff two versions given as lists of Person / Publication objects."""
+    people = diff_records({p.id: p.to_record() for p in old_people}, {p.id: p.to_record() for p in new_people})
+    pubs = diff_records({p.id: p.to_record() for p in old_pubs}, {p.id: p.to_record() for p in new_pubs})
+    old_auth = _authorship(old_pubs)
+    new_auth = _authorship(new_pubs)
+    return DatasetDiff(people, pubs, new_auth - old_auth, old_auth - new_auth)
+
+
+def diff_ndjson(old_personnel: str, new_personnel: str, old_publications: str, new_publications: str) -> DatasetDiff:
+    """Diff two versions of the personnel/publication NDJSON files."""
+    return diff_datasets(
+        NDJSONPersonnelSource(old_personnel).load_people(),
+        NDJSONPersonnelSource(new_personnel).load_people(),
+        NDJSONPublicationSource(old_publications).load_publications(),
+        NDJSONPublicationSource(new_publications).load_publications(),
+    )
+
+
+def diff_graphs(old_graph, new_graph) -> dict:
+    """Node and edge differences between two Graph snapshots."""
+    def _edges(g):
+        return {tuple(sorted((a, b))) for a in g.nodes() for b in g.neighbors(a)}
+    old_nodes, new_nodes = set(old_graph.nodes()), set(new_graph.nodes())
+    old_edges, new_edges = _edges(old_graph), _edges(new_graph)
+    return {
+        "nodes": {"added": sorted(new_nodes - old_nodes), "removed": sorted(old_nodes - new_nodes)},
+        "edges": {"added": sorted(new_edges - old_edges), "removed": sorted(old_edges - new_edges)},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff two versions of personnel/publications NDJSON.")
+    parser.add_argument("old_personnel")
+    parser.add_argument("new_personnel")
+    parser.add_argument("old_publications")
+    parser.add_argument("new_publications")
+    parser.add_argument("--json", action="store_true", help="print the full diff as JSON")
+    args = parser.parse_args()
+    d = diff_ndjson(args.old_personnel, args.new_personnel, args.old_publications, args.new_publications)
+    print(json.dumps(d.to_dict(), indent=2) if args.json else d.summary())
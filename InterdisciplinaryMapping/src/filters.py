@@ -0,0 +1,158 @@
+# filters.py
+import argparse
+import re
+
+_TOKEN = re.compile(r"[^a-z]+")
+
+
+def _lower_set(values):
+    if not values:
+        return None
+    return frozenset(str(v).strip().lower() for v in values if str(v).strip())
+
+
+def _team_tokens(team) -> set:
+    """Tokens of a team label; "Discover & Direct" matches both teams (as in the page filter)."""
+    return {t for t in _TOKEN.split(str(team or "").lower()) if t}
+
+
+def parse_years(spec: str):
+    """Parse "2021-2023,2025" into {"2021", "2022", "2023", "2025"}; ValueError on anything else."""
+    years = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                lo, hi = (int(x) for x in part.split("-", 1))
+                years.update(str(y) for y in range(lo, hi + 1))
+            else:
+                years.add(str(int(part)))
+        except ValueError:
+            raise ValueError(f"not a year or year range: {part!r}") from None
+    return years
+
+
+def _years_arg(spec: str):
+    """argparse type for --years: a usage error instead of a traceback."""
+    try:
+        return parse_years(spec)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+class ViewFilter:
+    """Records a view can show, declared before ingest so sources can skip the rest.
+
+    None / empty means "no restriction". `has_publications` keeps only people
+    who author at least one publication that passes the publication filters.
+    """
+    __slots__ = ("active_only", "has_publications", "teams", "subteams", "years", "types")
+
+    def __init__(self, active_only: bool = False, has_publications: bool = False,
+                 teams=None, subteams=None, years=None, types=None):
+        self.active_only = bool(active_only)
+        self.has_publications = bool(has_publications)
+        self.teams = _lower_set(teams)
+        self.subteams = _lower_set(subteams)
+        self.years = frozenset(str(y).strip() for y in years) if years else None
+        self.types = _lower_set(types)
+
+    @property
+    def restricts_people(self) -> bool:
+        """True when person records themselves are filtered (active flag / subteam)."""
+        return self.active_only or self.subteams is not None
+
+    @property
+    def restricts_publications(self) -> bool:
+        return self.teams is not None or self.years is not None or self.types is not None
+
+    def __bool__(self):
+        return self.restricts_people or self.has_publications or self.restricts_publications
+
+    # --- predicates on field values (shared by NDJSON parsing and model objects) ---
+
+    def accepts_person(self, active, subteam) -> bool:
+        if self.active_only and not active:
+            return False
+        if self.subteams is not None and str(subteam or "").strip().lower() not in self.subteams:
+            return False
+        return True
+
+    def accepts_publication(self, team, year, ptype) -> bool:
+        if self.years is not None and str(year or "").strip() not in self.years:
+            return False
+        if self.types is not None and str(ptype or "").strip().lower() not in self.types:
+            return False
+        if self.teams is not None and not self._team_matches(team):
+            return False
+        return True
+
+    def _team_matches(self, team) -> bool:
+        return bool(_team_tokens(team) & self.teams) or str(team or "").strip().lower() in self.teams
+
+    # --- SQLiteGraphStore query arguments ---
+
+    def person_query(self, team_values=()) -> dict:
+        """`team_values` as for publication_query; authorship counts only publications in view."""
+        q = {}
+        if self.active_only:
+            q["active"] = True
+        if self.subteams is not None:
+            q["subteams"] = sorted(self.subteams)
+        if self.has_publications:
+            q["with_publications"] = self.publication_query(team_values) or True
+        return q
+
+    def publication_query(self, team_values=()) -> dict:
+        """`team_values` are the distinct team labels in the store; matching ones become an IN list."""
+        q = {}
+        if self.teams is not None:
+            q["teams"] = [t for t in team_values if self._team_matches(t)]
+        if self.years is not None:
+            q["years"] = sorted(self.years)
+        if self.types is not None:
+            q["types"] = sorted(self.types)
+        return q
+
+    # --- command line ---
+
+    def to_argv(self) -> list:
+        """Arguments that recreate this filter via add_view_arguments / from_args."""
+        argv = []
+        if self.active_only:
+            argv.append("--active-only")
+        if self.has_publications:
+            argv.append("--has-publications")
+        for flag, values in (("--team", self.teams), ("--subteam", self.subteams), ("--type", self.types)):
+            for v in sorted(values or ()):
+                argv += [flag, v]
+        if self.years is not None:
+            argv += ["--years", ",".join(sorted(self.years))]
+        return argv
+
+    @classmethod
+    def from_args(cls, args) -> "ViewFilter":
+        return cls(
+            active_only=args.active_only,
+            has_publications=args.has_publications,
+            teams=args.team,
+            subteams=args.subteam,
+            # already parsed by add_view_arguments (type=_years_arg)
+            years=args.years or None,
+            types=args.type,
+        )
+
+
+def add_view_arguments(parser):
+    """Add the view filter flags to an argparse parser (see ViewFilter.from_args)."""
+    group = parser.add_argument_group("view filters (applied while reading the data)")
+    group.add_argument("--active-only", action="store_true", help="only active people")
+    group.add_argument("--has-publications", action="store_true",
+                       help="only people with at least one (filtered) publication")
+    group.add_argument("--team", action="append", help="publication team (repeatable)")
+    group.add_argument("--subteam", action="append", help="person subteam (repeatable)")
+    group.add_argument("--years", type=_years_arg, help='publication years, e.g. "2-3" or "2021-2023,2025"')
+    group.add_argument("--type", action="append", help="publication type (repeatable)")
+    return group
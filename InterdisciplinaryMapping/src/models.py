@@ -1,11 +1,101 @@
+import sys
+
+
+def normalize_id(value) -> str:
+    """Canonical string form of a person/publication id.
+
+    NDJSON ids arrive as ints (``3``), floats (``3.0``) or strings (``" 3 "``);
+    all of them map to ``"3"`` so lookups by id always agree.
+    """
+    if value is None or isinstance(value, bool):
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return sys.intern(str(value).strip())
+
+
+def intern_str(value) -> str:
+    """Interned string for small repeated values (team, type, venue, subteam)."""
+    if value is None:
+        return ""
+    return sys.intern(str(value).strip())
+
+
 class Person:
-    def __init__(self, person_id: str, name: str = ""):
-        self.id = person_id
+    __slots__ = ("id", "name", "subteam", "active", "PI")
+
+    def __init__(self, person_id: str, name: str = "", subteam: str = "", active: bool = False, PI: bool = False):
+        self.id = normalize_id(person_id)
         self.name = name
+        self.subteam = intern_str(subteam)
+        self.active = bool(active)
+        self.PI = bool(PI)
+
+    def to_record(self) -> dict:
+        """NDJSON-shaped dict, as read by the exporter and visualizer."""
+        return {"id": self.id, "name": self.name, "subteam": self.subteam, "active": self.active, "PI": self.PI}
+
 
 class Publication:
-    def __init__(self, pub_id: str, title: str = "", authors=None, short_title: str = ""):
-        self.id = pub_id
+    __slots__ = ("id", "title", "short_title", "authors", "team", "type", "year", "date", "doi", "venue")
+
+    def __init__(self, pub_id: str, title: str = "", authors=None, short_title: str = "",
+                 team: str = "", type: str = "", year: str = "", date: str = "", doi=None, venue: str = ""):
+        self.id = normalize_id(pub_id)
         self.title = title
         self.short_title = short_title or ""
-        self.authors = authors or []
\ No newline at end of file
+        self.authors = [normalize_id(a) for a in (authors or [])]
+        self.team = intern_str(team)
+        self.type = intern_str(type)
+        self.year = intern_str(year)
+        self.date = date or ""
+        self.doi = doi or None
+        self.venue = intern_str(venue)
+
+    def to_record(self) -> dict:
+        """NDJSON-shaped dict, as read by the exporter and visualizer."""
+        return {
+            "id": self.id, "team": self.team, "authors": list(self.authors), "title": self.title,
+            "type": self.type, "date": self.date, "year": self.year, "doi": self.doi,
+            "venue": self.venue, "short_title": self.short_title,
+        }
+
+
+class IngestReport:
+    """Summary of records rejected or repaired while loading a source."""
+
+    def __init__(self, source: str = "", max_examples: int = 5):
+        self.source = source
+        self.max_examples = max_examples
+        self.loaded = 0
+        self.filtered = 0  # records skipped by a ViewFilter (not problems)
+        self.counts = {}
+        self.examples = {}
+
+    def add(self, problem: str, detail: str = ""):
+        self.counts[problem] = self.counts.get(problem, 0) + 1
+        ex = self.examples.setdefault(problem, [])
+        if detail and len(ex) < self.max_examples:
+            ex.append(detail)
+
+    @property
+    def ok(self) -> bool:
+        return not self.counts
+
+    def summary(self) -> str:
+        head = f"{self.source}: {self.loaded} records loaded"
+        if self.filtered:
+            head += f" ({self.filtered} outside the view)"
+        if self.ok:
+            return head
+        lines = [head + f", {sum(self.counts.values())} problems"]
+        for problem, n in sorted(self.counts.items()):
+            ex = self.examples.get(problem)
+            lines.append(f"  {problem}: {n}" + (f" (e.g. {'; '.join(ex)})" if ex else ""))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
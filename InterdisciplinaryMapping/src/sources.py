@@ -1,68 +1,238 @@
 # sources.py
-import json, os
-from .models import Person, Publication
+import itertools, json, os
+from .models import Person, Publication, IngestReport, normalize_id
+
+# records handed from a reader thread to the event loop at a time
+ASYNC_BATCH = 256
+
+
+async def _aiter_in_thread(iterable, batch_size: int = ASYNC_BATCH):
+    """Drive a blocking iterator from a worker thread, yielding items asynchronously."""
+    import asyncio  # only the concurrent builder needs it; keeps plain imports fast
+
+    it = iter(iterable)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(itertools.islice(it, batch_size)))
+        if not batch:
+            return
+        for item in batch:
+            yield item
+
 
 class PersonnelSource: # abstract base
     def load_people(self):
         raise NotImplementedError
 
+    def iter_people(self):
+        return iter(self.load_people())
+
+    async def aiter_people(self):
+        """Async iterator over people; blocking reads run in a worker thread."""
+        async for p in _aiter_in_thread(self.iter_people()):
+            yield p
+
 class PublicationSource: # abstract base
     def load_publications(self):
         raise NotImplementedError
 
+    def iter_publications(self):
+        return iter(self.load_publications())
+
+    async def aiter_publications(self):
+        """Async iterator over publications; blocking reads run in a worker thread."""
+        async for pub in _aiter_in_thread(self.iter_publications()):
+            yield pub
+
+
+def _iter_records(lines, report: IngestReport):
+    """Yield parsed JSON objects from NDJSON text lines.
+
+    Accumulates lines until a full JSON object parses (handles embedded
+    newlines).
+    """
+    buf = ""
+    for raw in lines:
+        # Append the line to the buffer and try parsing.
+        buf += raw
+        if not buf.strip():
+            buf = ""
+            continue
+        try:
+            rec = json.loads(buf)
+        except Exception:
+            # incomplete JSON — keep buffering
+            continue
+        buf = ""
+        if not isinstance(rec, dict):
+            report.add("not an object", repr(rec)[:40])
+            continue
+        yield rec
+    if buf.strip():
+        report.add("unparsed trailing data", buf.strip()[:40])
+
+
+def _pub_year(rec) -> str:
+    year = str(rec.get("project_year", "") or "").strip()
+    if not year:
+        year = str(rec.get("year", "") or "").strip()
+    date = rec.get("date", "") or ""
+    if not year and isinstance(date, str) and len(date) >= 4 and date[:4].isdigit():
+        year = date[:4]
+    return year
+
+
+def _parse_people(lines, report: IngestReport, view=None):
+    """Validate personnel records and yield Person objects.
+
+    Records rejected by `view` (a ViewFilter) are skipped before validation.
+    """
+    seen = set()
+    for rec in _iter_records(lines, report):
+        if view is not None and not view.accepts_person(rec.get("active", False), rec.get("subteam", "")):
+            report.filtered += 1
+            continue
+        # normalize and validate
+        pid = normalize_id(rec.get("id"))
+        if not pid:
+            report.add("missing id", str(rec.get("name", ""))[:40])
+            continue
+        if pid in seen:
+            report.add("duplicate id", pid)
+            continue
+        seen.add(pid)
+        name = str(rec.get("name", "") or "")
+        if not name:
+            report.add("missing name", pid)
+        report.loaded += 1
+        yield Person(pid, name, subteam=rec.get("subteam", ""),
+                     active=rec.get("active", False), PI=rec.get("PI", False))
+
+
+def _parse_publications(lines, report: IngestReport, view=None):
+    """Validate publication records and yield Publication objects.
+
+    Records rejected by `view` (a ViewFilter) are skipped before validation.
+    """
+    seen = set()
+    for rec in _iter_records(lines, report):
+        if view is not None and not view.accepts_publication(rec.get("team", ""), _pub_year(rec), rec.get("type", "")):
+            report.filtered += 1
+            continue
+        pub_id = normalize_id(rec.get("id"))
+        if not pub_id:
+            report.add("missing id", str(rec.get("title", ""))[:40])
+            continue
+        if pub_id in seen:
+            report.add("duplicate id", pub_id)
+            continue
+        seen.add(pub_id)
+        raw_authors = rec.get("authors", [])
+        if not isinstance(raw_authors, list):
+            report.add("authors not a list", pub_id)
+            raw_authors = [raw_authors] if raw_authors else []
+        authors = [a for a in (normalize_id(a) for a in raw_authors) if a]
+        if len(authors) != len(raw_authors):
+            report.add("empty author id", pub_id)
+        if not authors:
+            report.add("no authors", pub_id)
+        report.loaded += 1
+        yield Publication(
+            pub_id,
+            str(rec.get("title", "") or ""),
+            authors,
+            short_title=str(rec.get("short_title", "") or ""),
+            team=rec.get("team", ""),
+            type=rec.get("type", ""),
+            year=_pub_year(rec),
+            date=rec.get("date", "") or "",
+            doi=rec.get("doi"),
+            venue=rec.get("venue", ""),
+        )
+
+
+def _file_lines(path: str):
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from f
+
+
+def _url_lines(url: str, timeout: float):
+    import io, urllib.request
+
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        yield from io.TextIOWrapper(resp, encoding="utf-8")
+
+
 class NDJSONPersonnelSource(PersonnelSource):
-    def __init__(self, path: str):
+    def __init__(self, path: str, view=None):
         self.path = path
+        self.view = view or None
+        self.report = IngestReport(path)
 
-    def load_people(self): # start list
-        people = []
-        if not os.path.exists(self.path):
-            return people
+    def iter_people(self):
+        self.report = IngestReport(self.path)
+        return _parse_people(_file_lines(self.path), self.report, self.view)
 
-    # Read file and accumulate lines until a full JSON object parses
-    # (handles embedded newlines).
-        with open(self.path, "r", encoding="utf-8") as f:
-            buf = ""
-            for raw in f:
-                # Append the line to the buffer and try parsing.
-                buf += raw
-                try:
-                    rec = json.loads(buf)
-                except Exception:
-                    # incomplete JSON — keep buffering
-                    continue
-                # parsed successfully: normalize and append
-                pid = str(rec.get("id", ""))
-                name = str(rec.get("name", ""))
-                if pid:
-                    people.append(Person(pid, name))
-                buf = ""
-        return people
+    def load_people(self):
+        return list(self.iter_people())
 
 class NDJSONPublicationSource(PublicationSource):
-    def __init__(self, path: str):
+    def __init__(self, path: str, view=None):
         self.path = path
+        self.view = view or None
+        self.report = IngestReport(path)
+
+    def iter_publications(self):
+        self.report = IngestReport(self.path)
+        return _parse_publications(_file_lines(self.path), self.report, self.view)
 
     def load_publications(self):
-        pubs = []
-        if not os.path.exists(self.path):
-            return pubs
+        return list(self.iter_publications())
 
-    # Accumulate lines until a complete JSON object parses.
-        with open(self.path, "r", encoding="utf-8") as f:
-            buf = ""
-            for raw in f:
-                buf += raw
-                try:
-                    rec = json.loads(buf)
-                except Exception:
-                    continue
-                pub_id = str(rec.get("id", ""))
-                title = str(rec.get("title", ""))
-                short_title = str(rec.get("short_title", ""))
-                raw_authors = rec.get("authors", [])
-                authors = [str(a) for a in raw_authors]
-                if pub_id:
-                    pubs.append(Publication(pub_id, title, authors, short_title=short_title))
-                buf = ""
-        return pubs
+
+class HTTPPersonnelSource(PersonnelSource):
+    """Personnel NDJSON streamed from an HTTP endpoint (e.g. the HR export service)."""
+
+    def __init__(self, url: str, timeout: float = 30.0, view=None):
+        self.url = url
+        self.timeout = timeout
+        self.view = view or None
+        self.report = IngestReport(url)
+
+    def iter_people(self):
+        self.report = IngestReport(self.url)
+        return _parse_people(_url_lines(self.url, self.timeout), self.report, self.view)
+
+    def load_people(self):
+        return list(self.iter_people())
+
+class HTTPPublicationSource(PublicationSource):
+    """Publication NDJSON streamed from an HTTP endpoint."""
+
+    def __init__(self, url: str, timeout: float = 30.0, view=None):
+        self.url = url
+        self.timeout = timeout
+        self.view = view or None
+        self.report = IngestReport(url)
+
+    def iter_publications(self):
+        self.report = IngestReport(self.url)
+        return _parse_publications(_url_lines(self.url, self.timeout), self.report, self.view)
+
+    def load_publications(self):
+        return list(self.iter_publications())
+
+
+def personnel_source_for(spec: str, view=None) -> PersonnelSource:
+    """Pick a personnel source for a path or http(s) URL."""
+    if spec.startswith(("http://", "https://")):
+        return HTTPPersonnelSource(spec, view=view)
+    return NDJSONPersonnelSource(spec, view=view)
+
+
+def publication_source_for(spec: str, view=None) -> PublicationSource:
+    """Pick a publication source for a path or http(s) URL."""
+    if spec.startswith(("http://", "https://")):
+        return HTTPPublicationSource(spec, view=view)
+    return NDJSONPublicationSource(spec, view=view)
@@ -0,0 +1,258 @@
+# store.py
+import os, sqlite3
+from .models import Person, Publication, normalize_id
+from .sources import PersonnelSource, PublicationSource, NDJSONPersonnelSource, NDJSONPublicationSource
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id      TEXT PRIMARY KEY,
+    name    TEXT NOT NULL DEFAULT '',
+    subteam TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    active  INTEGER NOT NULL DEFAULT 0,
+    pi      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS publications (
+    id          TEXT PRIMARY KEY,
+    title       TEXT NOT NULL DEFAULT '',
+    short_title TEXT NOT NULL DEFAULT '',
+    team        TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    type        TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    year        TEXT NOT NULL DEFAULT '',
+    date        TEXT NOT NULL DEFAULT '',
+    doi         TEXT,
+    venue       TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS authorship (
+    pub_id    TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    PRIMARY KEY (pub_id, position)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_people_subteam ON people(subteam);
+CREATE INDEX IF NOT EXISTS idx_people_active ON people(active);
+CREATE INDEX IF NOT EXISTS idx_pubs_year ON publications(year);
+CREATE INDEX IF NOT EXISTS idx_pubs_team ON publications(team);
+CREATE INDEX IF NOT EXISTS idx_authorship_person ON authorship(person_id);
+"""
+
+# keep well under SQLite's host-parameter limit
+_CHUNK = 500
+# records inserted per executemany while importing
+_BATCH = 5000
+
+
+def _file_signature(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _in_clause(column: str, values) -> str:
+    # an empty list matches nothing (rather than being dropped as "no filter")
+    if not values:
+        return "0"
+    return f"{column} IN ({','.join('?' * len(values))})"
+
+
+class SQLiteGraphStore:
+    """Persistent, indexed copy of the personnel/publication NDJSON.
+
+    The NDJSON files are imported once (and again only when they change);
+    afterwards callers query just the rows a view needs instead of loading
+    every record into memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # sources may be read from a worker thread (see PersonnelSource.aiter_people)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.reports = ()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- import ---
+
+    def _get_meta(self, key: str) -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else ""
+
+    def import_ndjson(self, personnel_path: str, publications_path: str, force: bool = False) -> bool:
+        """Load NDJSON into the tables. Returns False when the store was already up to date.
+
+        Records are streamed from the files and inserted in batches of
+        _BATCH, so the import never holds the dataset in memory.
+        """
+        signature = _file_signature(personnel_path) + "|" + _file_signature(publications_path)
+        if not force and signature == self._get_meta("source_signature"):
+            return False
+
+        personnel_source = NDJSONPersonnelSource(personnel_path)
+        publication_source = NDJSONPublicationSource(publications_path)
+
+        with self.conn:
+            self.conn.execute("DELETE FROM authorship")
+            self.conn.execute("DELETE FROM people")
+            self.conn.execute("DELETE FROM publications")
+            people = []
+            for p in personnel_source.iter_people():
+                people.append((p.id, p.name, p.subteam, int(p.active), int(p.PI)))
+                if len(people) >= _BATCH:
+                    self._insert_people(people)
+                    people = []
+            self._insert_people(people)
+            pubs, authors = [], []
+            for p in publication_source.iter_publications():
+                pubs.append((p.id, p.title, p.short_title, p.team, p.type, p.year, p.date, p.doi, p.venue))
+                authors.extend((p.id, a, i) for i, a in enumerate(p.authors))
+                if len(pubs) >= _BATCH:
+                    self._insert_publications(pubs, authors)
+                    pubs, authors = [], []
+            self._insert_publications(pubs, authors)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('source_signature', ?)", (signature,)
+            )
+        self.reports = (personnel_source.report, publication_source.report)
+        return True
+
+    def _insert_people(self, rows):
+        self.conn.executemany("INSERT INTO people (id, name, subteam, active, pi) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _insert_publications(self, rows, author_rows):
+        self.conn.executemany(
+            "INSERT INTO publications (id, title, short_title, team, type, year, date, doi, venue) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.executemany("INSERT INTO authorship (pub_id, person_id, position) VALUES (?, ?, ?)", author_rows)
+
+    # --- queries ---
+
+    def _select(self, sql: str, where: list, params: list, ids_column: str = "", ids=None, order: str = ""):
+        """Run `sql` with the given WHERE terms, splitting large id lists into chunks."""
+        if ids is None:
+            chunks = [None]
+        else:
+            ids = [normalize_id(i) for i in ids]
+            chunks = [ids[i:i + _CHUNK] for i in range(0, len(ids), _CHUNK)]
+        for chunk in chunks:
+            terms = list(where)
+            args = list(params)
+            if chunk is not None:
+                terms.append(_in_clause(ids_column, chunk))
+                args.extend(chunk)
+            q = sql + (" WHERE " + " AND ".join(terms) if terms else "") + order
+            yield from self.conn.execute(q, args)
+
+    def people(self, ids=None, active=None, subteams=None, with_publications=None):
+        """Yield Person rows, optionally filtered by id, active flag, subteam and authorship.
+
+        `with_publications` keeps people who author a publication: any one
+        when True, or one passing publications() filters given as a dict.
+        """
+        where, params = [], []
+        if active is not None:
+            where.append("active = ?")
+            params.append(int(bool(active)))
+        if subteams is not None:
+            subteams = list(subteams)
+            where.append(_in_clause("subteam", subteams))
+            params.extend(subteams)
+        if with_publications:
+            pub_where, pub_params = self._publication_where(
+                **(with_publications if isinstance(with_publications, dict) else {}))
+            where.append(
+                "EXISTS (SELECT 1 FROM authorship a JOIN publications p ON p.id = a.pub_id "
+                "WHERE a.person_id = people.id" + "".join(" AND " + t for t in pub_where) + ")"
+            )
+            params.extend(pub_params)
+        for pid, name, subteam, act, pi in self._select(
+            "SELECT id, name, subteam, active, pi FROM people", where, params, "id", ids, " ORDER BY rowid"
+        ):
+            yield Person(pid, name, subteam=subteam, active=bool(act), PI=bool(pi))
+
+    @staticmethod
+    def _publication_where(teams=None, years=None, types=None):
+        """WHERE terms and parameters for the publication filters (table alias `p`)."""
+        where, params = [], []
+        for column, values in (("p.team", teams), ("p.year", years), ("p.type", types)):
+            if values is not None:
+                values = [str(v) for v in values]
+                where.append(_in_clause(column, values))
+                params.extend(values)
+        return where, params
+
+    def publications(self, ids=None, teams=None, years=None, types=None):
+        """Yield Publication rows (with ordered author ids), optionally filtered."""
+        where, params = self._publication_where(teams, years, types)
+        sql = (
+            "SELECT p.id, p.title, p.short_title, p.team, p.type, p.year, p.date, p.doi, p.venue, "
+            "(SELECT group_concat(person_id, char(31)) FROM "
+            " (SELECT person_id FROM authorship a WHERE a.pub_id = p.id ORDER BY position)) "
+            "FROM publications p"
+        )
+        for row in self._select(sql, where, params, "p.id", ids, " ORDER BY p.rowid"):
+            pid, title, short_title, team, ptype, year, date, doi, venue, authors = row
+            yield Publication(
+                pid, title, authors.split("\x1f") if authors else [], short_title=short_title,
+                team=team, type=ptype, year=year, date=date, doi=doi, venue=venue,
+            )
+
+    def team_values(self):
+        """Distinct publication team labels (used to expand team filters into an IN list)."""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT team FROM publications")]
+
+    def authorship(self, person_ids=None, pub_ids=None):
+        """Yield (person_id, pub_id) pairs."""
+        if person_ids is not None:
+            rows = self._select("SELECT person_id, pub_id FROM authorship", [], [], "person_id", person_ids)
+        else:
+            rows = self._select("SELECT person_id, pub_id FROM authorship", [], [], "pub_id", pub_ids)
+        yield from rows
+
+    # NDJSON-shaped dicts for the exporter and visualizer
+
+    def person_records(self, **filters):
+        for p in self.people(**filters):
+            yield p.to_record()
+
+    def publication_records(self, **filters):
+        for p in self.publications(**filters):
+            yield p.to_record()
+
+
+class SQLitePersonnelSource(PersonnelSource):
+    def __init__(self, store: SQLiteGraphStore, view=None, **filters):
+        self.store = store
+        # a ViewFilter is pushed down into the WHERE clause
+        self.filters = dict(view.person_query(store.team_values()), **filters) if view else filters
+
+    def iter_people(self):
+        return self.store.people(**self.filters)
+
+    def load_people(self):
+        return list(self.iter_people())
+
+
+class SQLitePublicationSource(PublicationSource):
+    def __init__(self, store: SQLiteGraphStore, view=None, **filters):
+        self.store = store
+        self.filters = dict(view.publication_query(store.team_values()), **filters) if view else filters
+
+    def iter_publications(self):
+        return self.store.publications(**self.filters)
+
+    def load_publications(self):
+        return list(self.iter_publications())
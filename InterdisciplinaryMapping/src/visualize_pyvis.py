@@ -5,6 +5,8 @@ import webbrowser
 from visualization.data_loader import load_csv_data, load_ndjson_meta
 from visualization.layout import bipartite_positions, person_publication_counts, pubs_around_people_positions
 from visualization.network_builder import build_network
+from visualization.overlap import label_boxes, remove_overlaps
+from visualization.search_index import build_search_index
 from visualization.ui_injection import inject_ui
 
 
@@ -18,14 +20,21 @@ def main():
 
     # Compute layout and counts
     # Place publications on an outer ring and people inside
-    pos_map = pubs_around_people_positions(nodes)
     person_counts = person_publication_counts(edges)
+    boxes = label_boxes(nodes, person_counts)
+    pos_map = pubs_around_people_positions(nodes, boxes=boxes)
+    # Resolve the remaining node/label overlaps here so the page can keep these positions
+    remove_overlaps(pos_map, boxes)
 
     # Build network and write HTML
     out = build_network(nodes, edges, people_meta, pubs_meta, pos_map, person_counts, base_dir / "graph.html")
 
+    # Prebuilt typeahead index over the rendered nodes
+    rendered_ids = [str(n) for n in nodes["id"] if not str(n).startswith("person:") or person_counts.get(str(n), 0) > 0]
+    search_index = build_search_index(people_meta, pubs_meta, rendered_ids)
+
     # Inject UI enhancements
-    inject_ui(out, people_meta)
+    inject_ui(out, people_meta, search_index=search_index)
 
     # Open in browser
     opened = webbrowser.open("file://" + str(out))
@@ -0,0 +1,91 @@
+"""Edge bundling: one weighted edge per group pair instead of every person→publication link.
+
+Nodes are grouped on each side (people / publications) by ring sector of the
+computed layout, by community, or by subteam → team. Every (person group,
+publication group) pair with enough links becomes a single bundle edge
+between two invisible anchor nodes placed at the groups' centroids. The
+member edges stay in the page, hidden and tagged with their bundle id, so
+assets/vis_ui.js can expand them on zoom or selection.
+"""
+from typing import Dict, Iterable, List, Tuple
+import math
+
+BUNDLE_COLOR = "#666666"
+
+
+def default_sectors(edge_count: int, per_pair: int = 4) -> int:
+    """Sector count giving about `per_pair` links per (sector, sector) pair, within [4, 48]."""
+    return max(4, min(48, int(math.sqrt(edge_count / per_pair))))
+
+
+def sector_groups(pos_map: Dict[str, Tuple[float, float]], sectors: int = 24) -> Dict[str, int]:
+    """Angular sector of each positioned node around the layout's center."""
+    if not pos_map:
+        return {}
+    cx = sum(x for x, _ in pos_map.values()) / len(pos_map)
+    cy = sum(y for _, y in pos_map.values()) / len(pos_map)
+    step = 2.0 * math.pi / sectors
+    return {
+        nid: int((math.atan2(y - cy, x - cx) % (2.0 * math.pi)) // step) % sectors
+        for nid, (x, y) in pos_map.items()
+    }
+
+
+def team_groups(node_ids: Iterable[str], people_meta: dict, pubs_meta: dict) -> Dict[str, str]:
+    """Subteam for people and team for publications (lowercased; unknown → "")."""
+    groups = {}
+    for nid in node_ids:
+        kind, _, raw = str(nid).partition(":")
+        meta = people_meta.get(raw, {}) if kind == "person" else pubs_meta.get(raw, {})
+        value = meta.get("subteam", "") if kind == "person" else meta.get("team", "")
+        groups[nid] = str(value or "").strip().lower()
+    return groups
+
+
+def _bundle_width(count: int) -> float:
+    return round(1.0 + 1.5 * math.log2(count), 2)
+
+
+def bundle_edges(edges: Iterable[Tuple[str, str]], pos_map: Dict[str, Tuple[float, float]],
+                 groups: Dict[str, object], min_size: int = 3):
+    """Group person→publication edges by (person group, publication group).
+
+    Returns (anchors, bundles, membership):
+      anchors    {anchor_id: (x, y)} centroid of the group's bundled endpoints
+      bundles    [{"id", "from", "to", "count", "width"}] one per group pair
+      membership {(source, target): bundle id} for every bundled edge
+    Pairs with fewer than `min_size` links, and edges whose endpoints have no
+    group, are left unbundled.
+    """
+    members: Dict[tuple, List[Tuple[str, str]]] = {}
+    for source, target in edges:
+        person, pub = (source, target) if str(source).startswith("person:") else (target, source)
+        gp, gu = groups.get(person), groups.get(pub)
+        if gp is None or gu is None:
+            continue
+        members.setdefault((gp, gu), []).append((source, target))
+
+    anchors: Dict[str, Tuple[float, float]] = {}
+    sums: Dict[str, list] = {}
+    bundles = []
+    membership = {}
+    for (gp, gu), pairs in sorted(members.items(), key=lambda kv: str(kv[0])):
+        if len(pairs) < min_size:
+            continue
+        bid = f"{gp}>{gu}"
+        a_from, a_to = f"bundle:p:{gp}", f"bundle:u:{gu}"
+        for source, target in pairs:
+            membership[(source, target)] = bid
+            for nid in (source, target):
+                anchor = a_from if str(nid).startswith("person:") else a_to
+                x, y = pos_map.get(nid, (0, 0))
+                acc = sums.setdefault(anchor, [0.0, 0.0, set()])
+                if nid not in acc[2]:
+                    acc[2].add(nid)
+                    acc[0] += x
+                    acc[1] += y
+        bundles.append({"id": bid, "from": a_from, "to": a_to, "count": len(pairs), "width": _bundle_width(len(pairs))})
+
+    for anchor, (sx, sy, nodes) in sums.items():
+        anchors[anchor] = (int(round(sx / len(nodes))), int(round(sy / len(nodes))))
+    return anchors, bundles, membership
@@ -0,0 +1,90 @@
+"""Collaboration clusters via vectorized label propagation.
+
+Works on the edge list as integer arrays (numpy, which pandas already
+depends on), so each round is a couple of sorts over the arcs instead of a
+Python loop per node. Runs in seconds on million-edge graphs.
+"""
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Palette for community coloring; ids beyond its length wrap around.
+COMMUNITY_COLORS = [
+    "#4e79a7", "#f28e2b", "#59a14f", "#e15759", "#76b7b2", "#edc948",
+    "#b07aa1", "#ff9da7", "#9c755f", "#86bcb6", "#d37295", "#a0cbe8",
+]
+
+
+def community_color(cid: int) -> str:
+    return COMMUNITY_COLORS[int(cid) % len(COMMUNITY_COLORS)]
+
+
+def detect_communities(edges_df, seed: int = 0, max_iter: int = 60, tol: float = 1e-4) -> Dict[str, int]:
+    """Label propagation over the undirected edges in `edges_df` (source, target).
+
+    Each round a random half of the nodes (fixed by `seed`) adopts the label
+    most common among its neighbors; a node keeps its label when that label is
+    already among the most common. Updating only half the nodes per round
+    avoids the label oscillation plain synchronous propagation shows on
+    bipartite graphs such as person/publication. Stops once at most `tol` of
+    the nodes would still change. Returns {node_id: community} with
+    communities numbered 0.. by decreasing size.
+    """
+    if len(edges_df) == 0:
+        return {}
+    # hash-based factorize is much faster than sorting millions of strings
+    codes, ids = pd.factorize(np.concatenate([
+        edges_df["source"].astype(str).to_numpy(),
+        edges_df["target"].astype(str).to_numpy(),
+    ]), sort=True)
+    n = len(ids)
+    m = len(edges_df)
+    codes = codes.astype(np.int64)
+    # both directions, sorted by receiving node: u[i] hears the label of v[i]
+    u = np.concatenate([codes[:m], codes[m:]])
+    v = np.concatenate([codes[m:], codes[:m]])
+    order = np.argsort(u, kind="stable")
+    u, v = u[order], v[order]
+    labels = np.arange(n, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    max_unstable = int(tol * n)
+
+    for _ in range(max_iter):
+        # votes per (node, label) pair; keys sort by node first, then label
+        keys = np.sort(u * n + labels[v])
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        votes = np.diff(np.r_[starts, len(keys)])
+        keys = keys[starts]
+        ku = keys // n
+        kl = keys % n
+
+        # best label per node, random tie-break (jitter < 1 only separates ties)
+        score = votes + rng.random(n)[kl] * 0.5
+        node_start = np.flatnonzero(np.r_[True, ku[1:] != ku[:-1]])
+        best_score = np.maximum.reduceat(score, node_start)
+        node_of = np.repeat(np.arange(len(node_start)), np.diff(np.r_[node_start, len(ku)]))
+        is_best = score == best_score[node_of]
+        # first maximum per node (entries are grouped by node, so reduceat on the index works)
+        best_pos = np.minimum.reduceat(np.where(is_best, np.arange(len(ku)), len(ku)), node_start)
+        best_node = ku[best_pos]
+        best_label = kl[best_pos]
+        best_votes = votes[best_pos]
+
+        # votes for the node's current label (0 if no neighbor has it)
+        cur_keys = best_node * n + labels[best_node]
+        pos = np.minimum(np.searchsorted(keys, cur_keys), len(keys) - 1)
+        cur_votes = np.where(keys[pos] == cur_keys, votes[pos], 0)
+
+        unstable = cur_votes < best_votes
+        if unstable.sum() <= max_unstable:
+            break
+        update = unstable & (rng.random(len(best_node)) < 0.5)
+        labels[best_node[update]] = best_label[update]
+
+    # renumber: biggest community first, ties by first member
+    uniq, first_idx, sizes = np.unique(labels, return_index=True, return_counts=True)
+    rank = np.lexsort((first_idx, -sizes))
+    remap = np.empty(len(uniq), dtype=np.int64)
+    remap[rank] = np.arange(len(uniq))
+    comm = remap[np.searchsorted(uniq, labels)]
+    return dict(zip(list(ids), comm.tolist()))
@@ -1,15 +1,19 @@
 from pathlib import Path
 import json
-import pandas as pd
+
+from src.models import normalize_id
 
 
 def load_csv_data(base_dir: Path):
+    import pandas as pd  # heavy; only the render path needs it
+
     nodes = pd.read_csv(base_dir / "data" / "nodes.csv")
     edges = pd.read_csv(base_dir / "data" / "edges.csv")
     return nodes, edges
 
 
-def load_ndjson_meta(base_dir: Path):
+def load_ndjson_meta(base_dir: Path, view=None):
+    """Metadata for people and publications keyed by id; records `view` rejects are skipped."""
     people_meta = {}
     pubs_meta = {}
 
@@ -26,7 +30,9 @@ def load_ndjson_meta(base_dir: Path):
                     rec = json.loads(line)
                 except Exception:
                     continue
-                pid = str(rec.get("id", "")).strip()
+                if view and not view.accepts_person(rec.get("active", False), rec.get("subteam", "")):
+                    continue
+                pid = normalize_id(rec.get("id"))
                 if not pid:
                     continue
                 people_meta[pid] = {
@@ -46,7 +52,7 @@ def load_ndjson_meta(base_dir: Path):
                     rec = json.loads(line)
                 except Exception:
                     continue
-                pubid = str(rec.get("id", "")).strip()
+                pubid = normalize_id(rec.get("id"))
                 if not pubid:
                     continue
                 year = str(rec.get("project_year", "")).strip()
@@ -55,6 +61,8 @@ def load_ndjson_meta(base_dir: Path):
                 date = rec.get("date", "") or ""
                 if not year and isinstance(date, str) and len(date) >= 4 and date[:4].isdigit():
                     year = date[:4]
+                if view and not view.accepts_publication(rec.get("team", ""), year, rec.get("type", "")):
+                    continue
                 pubs_meta[pubid] = {
                     "team": rec.get("team", ""),
                     "title": rec.get("title", ""),
@@ -62,8 +70,44 @@ def load_ndjson_meta(base_dir: Path):
                     "type": rec.get("type", ""),
                     "year": year,
                     "doi": rec.get("doi", None),
-                    "authors": [str(a) for a in rec.get("authors", [])],
+                    "authors": [normalize_id(a) for a in rec.get("authors", [])],
                     "venue": rec.get("venue", ""),
                 }
 
     return people_meta, pubs_meta
+
+
+def load_store_meta(store, view=None):
+    """Same shape as load_ndjson_meta, read from a SQLiteGraphStore.
+
+    `view` (the one the exporter used) is pushed into the queries, so each
+    table is read in a single scan of the rows in view. Like the NDJSON path
+    it keeps people regardless of authorship (has_publications only limits
+    the graph), so the selectable people are the same for either source.
+    """
+    from src.store import SQLitePersonnelSource, SQLitePublicationSource
+
+    people_meta = {}
+    pubs_meta = {}
+
+    for p in SQLitePersonnelSource(store, view, with_publications=None).iter_people():
+        people_meta[p.id] = {
+            "name": p.name,
+            "subteam": p.subteam,
+            "active": p.active,
+            "PI": p.PI,
+        }
+
+    for pub in SQLitePublicationSource(store, view).iter_publications():
+        pubs_meta[pub.id] = {
+            "team": pub.team,
+            "title": pub.title,
+            "short_title": pub.short_title,
+            "type": pub.type,
+            "year": pub.year,
+            "doi": pub.doi,
+            "authors": list(pub.authors),
+            "venue": pub.venue,
+        }
+
+    return people_meta, pubs_meta
@@ -0,0 +1,183 @@
+"""Versioned graph files, and the delta files that bring a page up to date.
+
+build_network can write a snapshot of the rendered graph:
+
+    {"version": <sha1 of nodes+edges+people+views>, "nodes": [node dicts], "edges": [edge dicts],
+     "people": [people selector entries], "views": {filtered view positions},
+     "layout": {layout inputs}}
+
+`views` are the precomputed filter layouts (see visualization/filter_views.py).
+
+`layout` records what the positions were computed from (layout flags and
+view), so a later build only keeps those positions when it matches.
+
+With --delta the page does not embed the graph. Each build publishes its
+snapshot as an immutable deltas/graph-<version>.json, which a stable
+graph.html loads through deltas/manifest.json. Diffing two snapshots by node
+id / (from, to) gives a delta:
+
+    {"v": 1, "from": <old version>, "to": <new version>,
+     "nodes": {"add": [node dicts], "update": [{id, changed fields}], "remove": [ids]},
+     "edges": {"add": [edge dicts], "remove": [[from, to]]},
+     "people": [...], "views": {...}}       (each only when it changed)
+
+The manifest maps each from-version to its delta file (and, under "next",
+to the version that delta leads to) and lists the recent base files. Deltas
+no kept base leads to are pruned along with the bases. assets/vis_ui.js starts from the base this browser loaded last,
+which is probably still in its HTTP cache, and follows the delta chain to
+"latest". A new visitor loads the latest base directly.
+"""
+from pathlib import Path
+from typing import Optional
+import hashlib
+import json
+
+MANIFEST_NAME = "manifest.json"
+# base files kept for returning visitors; older ones are deleted
+KEEP_BASES = 5
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def network_snapshot(nodes: list, edges: list, people: list = None, layout: dict = None, views: dict = None) -> dict:
+    """Snapshot of pyvis `net.nodes` / `net.edges` (plus the page's people list and filter views), versioned by content hash.
+
+    `layout` is stored alongside but not hashed: the positions already are.
+    """
+    nodes = sorted((dict(n) for n in nodes), key=lambda n: str(n["id"]))
+    edges = sorted((dict(e) for e in edges), key=lambda e: (str(e["from"]), str(e["to"])))
+    content = {"nodes": nodes, "edges": edges, "people": list(people or []), "views": views or {}}
+    version = hashlib.sha1(_canonical(content).encode("utf-8")).hexdigest()
+    return dict(content, version=version, layout=layout or {})
+
+
+def write_snapshot(snapshot: dict, path: Path) -> Path:
+    path.write_text(json.dumps(snapshot, separators=(",", ":"), default=str), encoding="utf-8")
+    return path
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_snapshot(path: Path) -> Optional[dict]:
+    """The snapshot at `path`, or None if it is missing or unreadable."""
+    return _read_json(path)
+
+
+def diff_snapshots(old: dict, new: dict) -> dict:
+    """Delta turning snapshot `old` into `new` (hash join on node id and edge endpoints)."""
+    old_nodes = {n["id"]: n for n in old["nodes"]}
+    new_nodes = {n["id"]: n for n in new["nodes"]}
+    add, update = [], []
+    for nid, node in new_nodes.items():
+        prev = old_nodes.get(nid)
+        if prev is None:
+            add.append(node)
+        elif prev != node:
+            changed = {k: v for k, v in node.items() if prev.get(k) != v}
+            changed.update({k: None for k in prev if k not in node})
+            changed["id"] = nid
+            update.append(changed)
+    remove = [nid for nid in old_nodes if nid not in new_nodes]
+
+    old_edges = {(e["from"], e["to"]): e for e in old["edges"]}
+    new_edges = {(e["from"], e["to"]): e for e in new["edges"]}
+    edge_add = [e for k, e in new_edges.items() if old_edges.get(k) != e]
+    # a restyled edge is removed and re-added
+    edge_remove = [list(k) for k, e in old_edges.items() if new_edges.get(k) != e]
+
+    delta = {
+        "v": 1,
+        "from": old["version"],
+        "to": new["version"],
+        "nodes": {"add": add, "update": update, "remove": remove},
+        "edges": {"add": edge_add, "remove": edge_remove},
+    }
+    if old.get("people", []) != new.get("people", []):
+        delta["people"] = new.get("people", [])
+    if old.get("views", {}) != new.get("views", {}):
+        delta["views"] = new.get("views", {})
+    return delta
+
+
+def _read_manifest(out_dir: Path) -> dict:
+    manifest = _read_json(out_dir / MANIFEST_NAME) or {}
+    manifest.setdefault("deltas", {})
+    manifest.setdefault("bases", [])
+    manifest.setdefault("next", {})
+    return manifest
+
+
+def _prune_deltas(manifest: dict, out_dir: Path) -> None:
+    """Drop the deltas (entries and files) that no kept base leads to."""
+    deltas, nxt = manifest["deltas"], manifest["next"]
+    reachable = set()
+    for version, _ in manifest["bases"]:
+        while version in deltas and version not in reachable:
+            reachable.add(version)
+            # manifests written before "next" existed: read it from the delta
+            version = nxt.get(version) or (_read_json(out_dir / deltas[version]) or {}).get("to")
+    for version in [v for v in deltas if v not in reachable]:
+        (out_dir / deltas.pop(version)).unlink(missing_ok=True)
+        nxt.pop(version, None)
+
+
+def _write_manifest(manifest: dict, out_dir: Path) -> None:
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def write_delta(delta: dict, out_dir: Path) -> Path:
+    """Write `delta` under `out_dir` and register it in the manifest. Returns the delta path."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{delta['from'][:12]}-{delta['to'][:12]}.json"
+    path = out_dir / name
+    path.write_text(json.dumps(delta, separators=(",", ":"), default=str), encoding="utf-8")
+
+    manifest = _read_manifest(out_dir)
+    manifest["deltas"][delta["from"]] = name
+    manifest["next"][delta["from"]] = delta["to"]
+    # the new version is the end of the chain (matters when data is reverted)
+    manifest["deltas"].pop(delta["to"], None)
+    manifest["next"].pop(delta["to"], None)
+    manifest["latest"] = delta["to"]
+    _write_manifest(manifest, out_dir)
+    return path
+
+
+def write_base(snapshot: dict, out_dir: Path, search_index: dict = None) -> Path:
+    """Publish `snapshot` as the latest immutable base file and register it in the manifest.
+
+    `search_index` is written next to it as search-<version>.json, replacing
+    the previous one. Only the KEEP_BASES most recent base files are kept.
+    Returns the base file path.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tag = snapshot["version"][:12]
+    name = f"graph-{tag}.json"
+    path = out_dir / name
+    if not path.exists():
+        path.write_text(json.dumps(snapshot, separators=(",", ":"), default=str), encoding="utf-8")
+
+    manifest = _read_manifest(out_dir)
+    bases = [b for b in manifest["bases"] if b[0] != snapshot["version"]] + [[snapshot["version"], name]]
+    for _, old_name in bases[:-KEEP_BASES]:
+        (out_dir / old_name).unlink(missing_ok=True)
+    manifest["bases"] = bases[-KEEP_BASES:]
+    manifest["latest"] = snapshot["version"]
+    _prune_deltas(manifest, out_dir)
+    # pages always load the latest search index, so the previous one can go
+    previous_search = manifest.pop("search", None)
+    search_name = f"search-{tag}.json"
+    if previous_search and previous_search != search_name:
+        (out_dir / previous_search).unlink(missing_ok=True)
+    if search_index is not None:
+        (out_dir / search_name).write_text(json.dumps(search_index, separators=(",", ":")), encoding="utf-8")
+        manifest["search"] = search_name
+    _write_manifest(manifest, out_dir)
+    return path
@@ -0,0 +1,136 @@
+"""Local dev server for `visualize_pyvis.py --watch`.
+
+Serves the output directory over http.server, exposes a server-sent events
+stream at /events, and polls the watched files' mtimes. On a change the
+caller's `rebuild(changed_paths)` returns the events to push; connected pages
+apply them (graph deltas, stylesheet swaps) without a full reload.
+"""
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+import json
+import queue
+import threading
+import time
+
+EVENTS_PATH = "/events"
+KEEPALIVE_SECONDS = 15
+
+
+class FileWatcher:
+    """Poll a set of glob patterns for added, removed or modified files."""
+
+    def __init__(self, root: Path, patterns: Iterable[str]):
+        self.root = root
+        self.patterns = list(patterns)
+        self._mtimes = self._scan()
+
+    def _scan(self) -> Dict[Path, int]:
+        found = {}
+        for pattern in self.patterns:
+            for path in self.root.glob(pattern):
+                try:
+                    found[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return found
+
+    def changes(self) -> List[Path]:
+        current = self._scan()
+        changed = [p for p, m in current.items() if self._mtimes.get(p) != m]
+        changed += [p for p in self._mtimes if p not in current]
+        self._mtimes = current
+        return changed
+
+
+class EventHub:
+    """Fan-out of server-sent events to every connected page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: List[queue.Queue] = []
+
+    def subscribe(self) -> queue.Queue:
+        q = queue.Queue()
+        with self._lock:
+            self._clients.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            if q in self._clients:
+                self._clients.remove(q)
+
+    def publish(self, event: str, data) -> int:
+        """Queue an event for all clients; returns how many were connected."""
+        msg = f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+        with self._lock:
+            for q in self._clients:
+                q.put(msg)
+            return len(self._clients)
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    hub: EventHub = None
+
+    def end_headers(self):
+        # always serve the latest build
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != EVENTS_PATH:
+            return super().do_GET()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        q = self.hub.subscribe()
+        try:
+            while True:
+                try:
+                    msg = q.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    msg = ": keepalive\n\n"
+                self.wfile.write(msg.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.unsubscribe(q)
+
+
+def start_server(root: Path, hub: EventHub, port: int = 8000, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve `root` (and /events from `hub`) on a background thread."""
+    handler = type("DevHandler", (_Handler,), {"hub": hub})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=str(root)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(root: Path, patterns: Iterable[str], rebuild: Callable[[List[Path]], List[Tuple[str, object]]],
+          hub: EventHub, interval: float = 0.1, settle: float = 0.05):
+    """Call `rebuild` for each batch of changed files and publish the events it returns. Runs until interrupted."""
+    watcher = FileWatcher(root, patterns)
+    while True:
+        time.sleep(interval)
+        changed = watcher.changes()
+        if not changed:
+            continue
+        # editors often write in several steps; fold those into one rebuild
+        time.sleep(settle)
+        changed += [p for p in watcher.changes() if p not in changed]
+        started = time.perf_counter()
+        try:
+            events = rebuild(changed)
+        except Exception as e:
+            print("⚠️ Rebuild failed:", e)
+            continue
+        for event, data in events:
+            hub.publish(event, data)
+        names = ", ".join(sorted(p.name for p in changed))
+        print(f"↻ {names} → rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,206 @@
+"""Precomputed per-person ego-network pages for the static site.
+
+For every person with publications this writes, under `ego/`:
+
+    person-<id>.json   2-hop fragment (person -> publications -> co-authors)
+    person-<id>.html   standalone page rendering that fragment
+
+File names depend only on the person id, so URLs stay stable across
+rebuilds. Pages are generated in parallel worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+import html
+import json
+import math
+import os
+import re
+
+from visualization.labels import display_label
+
+PUB_RADIUS = 240
+COAUTHOR_RADIUS = 480
+CENTER_COLOR = "#ff4d4f"
+PERSON_COLOR = "#87CEEB"
+PUB_COLOR = "#90EE90"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def ego_page_name(person_id: str) -> str:
+    """Stable file stem for a person's ego page (mirrored in assets/vis_ui.js)."""
+    return "person-" + _UNSAFE.sub("_", str(person_id))
+
+
+def ego_subgraph(graph, center: str) -> Tuple[List[str], List[str], List[Tuple[str, str]]]:
+    """Publications and co-authors within two hops of `center`, plus the edges used to reach them."""
+    pubs = sorted(graph.neighbors(center))
+    coauthors = set()
+    edges = [(center, pub) for pub in pubs]
+    for pub in pubs:
+        for person in sorted(graph.neighbors(pub)):
+            if person == center:
+                continue
+            coauthors.add(person)
+            edges.append((person, pub))
+    return pubs, sorted(coauthors), edges
+
+
+def _ring(items: List[str], radius: int, angles: Dict[str, float] = None) -> Dict[str, Tuple[int, int]]:
+    pos = {}
+    n = len(items)
+    for i, nid in enumerate(items):
+        theta = angles[nid] if angles else (2.0 * math.pi * i) / max(n, 1)
+        pos[nid] = (int(round(radius * math.cos(theta))), int(round(radius * math.sin(theta))))
+    return pos
+
+
+def ego_fragment(graph, center: str, people_meta: dict, pubs_meta: dict) -> dict:
+    """JSON-serializable nodes/edges for one person's ego network, with fixed positions."""
+    pubs, coauthors, edges = ego_subgraph(graph, center)
+
+    # co-authors sit next to the first of their shared publications
+    pub_angle = {pub: (2.0 * math.pi * i) / max(len(pubs), 1) for i, pub in enumerate(pubs)}
+    first_pub = {}
+    for person, pub in edges:
+        if person != center:
+            first_pub.setdefault(person, pub)
+    coauthors.sort(key=lambda p: (pub_angle.get(first_pub.get(p), 0.0), p))
+    co_angle = {p: (2.0 * math.pi * (i + 0.5)) / max(len(coauthors), 1) for i, p in enumerate(coauthors)}
+
+    pos = {center: (0, 0)}
+    pos.update(_ring(pubs, PUB_RADIUS))
+    pos.update(_ring(coauthors, COAUTHOR_RADIUS, co_angle))
+
+    def _person(nid):
+        raw = nid.split(":", 1)[1] if ":" in nid else nid
+        meta = people_meta.get(raw, {})
+        name = meta.get("name") or raw
+        return {
+            "id": nid, "kind": "person", "label": display_label("person", name), "title": name,
+            "page": ego_page_name(raw) + ".html",
+            "color": CENTER_COLOR if nid == center else PERSON_COLOR,
+        }
+
+    def _pub(nid):
+        raw = nid.split(":", 1)[1] if ":" in nid else nid
+        meta = pubs_meta.get(raw, {})
+        label = meta.get("short_title") or meta.get("title") or raw
+        return {
+            "id": nid, "kind": "pub", "label": display_label("pub", label),
+            "title": meta.get("title") or label, "color": PUB_COLOR,
+        }
+
+    nodes = [_person(center)] + [_pub(p) for p in pubs] + [_person(p) for p in coauthors]
+    for n in nodes:
+        n["x"], n["y"] = pos[n["id"]]
+    return {"center": center, "nodes": nodes, "edges": [[a, b] for a, b in edges]}
+
+
+_PAGE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__ — Interdisciplinary Mapping</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="stylesheet" href="../assets/vis_styles.css">
+<script src="../lib/vis-9.1.2/vis-network.min.js"></script>
+<style>#ego { width: 100%; height: 80vh; border: 1px solid #e0e0e0; }</style>
+</head>
+<body>
+<div class="header">
+  <h1>__TITLE__</h1>
+  <div class="sub">Publications and co-authors · <a href="../graph.html">Full map</a></div>
+  <div class="legend"><span class="hint">Double-click a co-author to open their page</span></div>
+</div>
+<div id="ego"></div>
+<script>
+var EGO = __DATA__;
+var nodes = new vis.DataSet(EGO.nodes.map(function(n){ return { id: n.id, label: n.label, title: n.title, color: n.color, x: n.x, y: n.y, fixed: true, page: n.page, shape: 'dot', size: n.kind === 'person' ? 14 : 10 }; }));
+var edges = new vis.DataSet(EGO.edges.map(function(e){ return { from: e[0], to: e[1], color: '#666666', width: 1 }; }));
+var network = new vis.Network(document.getElementById('ego'), { nodes: nodes, edges: edges }, { physics: false, edges: { smooth: false } });
+network.on('doubleClick', function(p){ var n = p.nodes.length && nodes.get(p.nodes[0]); if (n && n.page && n.id !== EGO.center) window.location.href = n.page; });
+</script>
+</body>
+</html>
+"""
+
+
+def ego_page_html(fragment: dict) -> str:
+    center = next(n for n in fragment["nodes"] if n["id"] == fragment["center"])
+    data = json.dumps(fragment, separators=(",", ":")).replace("</", "<\\/")
+    return _PAGE.replace("__TITLE__", html.escape(center["title"])).replace("__DATA__", data)
+
+
+# per-process state, set once by the pool initializer
+_WORKER = {}
+
+
+def _init_worker(graph, people_meta, pubs_meta, out_dir):
+    _WORKER.update(graph=graph, people_meta=people_meta, pubs_meta=pubs_meta, out_dir=Path(out_dir))
+
+
+def _write_pages(person_nodes: List[str]) -> int:
+    g = _WORKER["graph"]
+    out_dir = _WORKER["out_dir"]
+    for center in person_nodes:
+        fragment = ego_fragment(g, center, _WORKER["people_meta"], _WORKER["pubs_meta"])
+        stem = ego_page_name(center.split(":", 1)[1])
+        (out_dir / f"{stem}.json").write_text(json.dumps(fragment, separators=(",", ":")), encoding="utf-8")
+        (out_dir / f"{stem}.html").write_text(ego_page_html(fragment), encoding="utf-8")
+    return len(person_nodes)
+
+
+def affected_ego_people(graph, changes) -> set:
+    """Person nodes whose ego page can differ after `changes` (a src.diff.DatasetDiff)."""
+    affected = set()
+    added, removed, modified = changes.people
+    for pid in [r["id"] for r in added + removed] + [k for k, _ in modified]:
+        node = f"person:{pid}"
+        affected.add(node)
+        # the person also appears on their co-authors' pages
+        for pub in graph.neighbors(node):
+            affected.update(graph.neighbors(pub))
+    added, removed, modified = changes.publications
+    for pub_id in [r["id"] for r in added + removed] + [k for k, _ in modified]:
+        affected.update(graph.neighbors(f"pub:{pub_id}"))
+    for person_id, pub_id in changes.authorship_added | changes.authorship_removed:
+        affected.add(f"person:{person_id}")
+        affected.update(graph.neighbors(f"pub:{pub_id}"))
+    return {n for n in affected if n.startswith("person:")}
+
+
+def write_ego_pages(graph, people_meta: dict, pubs_meta: dict, out_dir: Path, workers: int = None, chunk: int = 64,
+                    only=None) -> int:
+    """Write ego pages for every person with at least one publication. Returns the page count.
+
+    `only` (person node ids) rewrites just those pages, deleting the ones
+    whose person no longer has publications. A full rebuild deletes every
+    page in `out_dir` that no current person owns.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    people = sorted(n for n in graph.nodes() if n.startswith("person:") and graph.neighbors(n))
+    if only is None:
+        keep = {ego_page_name(p.split(":", 1)[1]) for p in people}
+        for ext in (".json", ".html"):
+            for page in out_dir.glob(f"person-*{ext}"):
+                if page.name[:-len(ext)] not in keep:
+                    page.unlink(missing_ok=True)
+    else:
+        only = set(only)
+        for gone in only.difference(people):
+            stem = ego_page_name(gone.split(":", 1)[1])
+            for ext in (".json", ".html"):
+                (out_dir / f"{stem}{ext}").unlink(missing_ok=True)
+        people = [p for p in people if p in only]
+    batches = [people[i:i + chunk] for i in range(0, len(people), chunk)]
+    if not batches:
+        return 0
+    workers = workers or min(len(batches), os.cpu_count() or 1)
+    if workers <= 1:
+        _init_worker(graph, people_meta, pubs_meta, out_dir)
+        return sum(_write_pages(b) for b in batches)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph, people_meta, pubs_meta, str(out_dir))) as pool:
+        return sum(pool.map(_write_pages, batches))
@@ -0,0 +1,82 @@
+"""Precomputed layouts for the page's subteam and PI-only filters.
+
+The filter panel (assets/vis_ui.js `__flt_apply`) hides nodes by the three
+subteam checkboxes and the PI-only box. Those combinations are few, so each
+filtered view is laid out here with the same ring layout and overlap pass as
+the full map, and the page moves nodes to these positions instead of running
+a relayout. A selection of specific people has too many combinations to
+precompute and is still laid out in the browser.
+
+    {"<sorted subteams joined by ','>[|pi]": {node_id: [x, y]}}
+"""
+from itertools import combinations
+from typing import Dict, Iterable, Set
+import re
+
+from visualization.layout import pubs_around_people_positions
+from visualization.overlap import remove_overlaps
+
+# the filter panel's checkboxes, as __flt_selectedSubteams reports them
+SUBTEAMS = ("discover", "direct", "develop")
+_TOKEN = re.compile(r"[^a-z]+")
+
+
+def view_key(subteams: Iterable[str], pi_only: bool) -> str:
+    """Key of a filtered view; matches the one assets/vis_ui.js builds."""
+    return ",".join(sorted(subteams)) + ("|pi" if pi_only else "")
+
+
+def visible_nodes(nodes_df, edges_df, people_meta, pubs_meta, person_pub_counts, subteams, pi_only) -> Set[str]:
+    """Nodes `__flt_apply` shows for these checkboxes (no people selected)."""
+    sels = set(subteams)
+    people = set()
+    for node_id, kind in zip(nodes_df["id"].astype(str), nodes_df["kind"].astype(str)):
+        # people without publications are not rendered
+        if not kind.lower().startswith("person") or person_pub_counts.get(node_id, 0) <= 0:
+            continue
+        meta = people_meta.get(node_id.split(":", 1)[1], {})
+        if pi_only:
+            show = bool(meta.get("PI", False))
+        else:
+            show = not sels or str(meta.get("subteam", "") or "").lower() in sels
+        if show:
+            people.add(node_id)
+
+    pairs = list(zip(edges_df["source"].astype(str), edges_df["target"].astype(str)))
+    pubs = set()
+    for a, b in pairs:
+        for person, other in ((a, b), (b, a)):
+            if person in people and other.startswith("pub:"):
+                pubs.add(other)
+    for node_id, kind in zip(nodes_df["id"].astype(str), nodes_df["kind"].astype(str)):
+        if kind.lower().startswith("person"):
+            continue
+        team = str(pubs_meta.get(node_id.split(":", 1)[1], {}).get("team", "")).lower()
+        if not sels or any(t in sels for t in _TOKEN.split(team) if t):
+            pubs.add(node_id)
+
+    # people left without a visible publication are hidden too
+    linked = {p for a, b in pairs for p, other in ((a, b), (b, a)) if p in people and other in pubs}
+    return linked | pubs
+
+
+def filter_view_positions(nodes_df, edges_df, people_meta, pubs_meta, person_pub_counts,
+                          boxes) -> Dict[str, Dict[str, list]]:
+    """Positions of the visible nodes in every subteam / PI-only view.
+
+    Views that show the whole map (no subteam or all of them, without PI-only)
+    are left out: the page restores the base layout for those.
+    """
+    views = {}
+    for size in range(len(SUBTEAMS) + 1):
+        for sels in combinations(SUBTEAMS, size):
+            for pi_only in (False, True):
+                if not pi_only and size in (0, len(SUBTEAMS)):
+                    continue
+                visible = visible_nodes(nodes_df, edges_df, people_meta, pubs_meta, person_pub_counts,
+                                        sels, pi_only)
+                subset = nodes_df[nodes_df["id"].astype(str).isin(visible)]
+                pos_map = pubs_around_people_positions(subset, boxes=boxes)
+                remove_overlaps(pos_map, boxes)
+                views[view_key(sels, pi_only)] = {nid: [x, y] for nid, (x, y) in sorted(pos_map.items())}
+    return views
@@ -0,0 +1,40 @@
+"""Label wrapping shared by the network builder and the layout passes."""
+
+# (width, max_lines) used when wrapping display labels
+PERSON_LABEL_WRAP = (18, 2)
+PUB_LABEL_WRAP = (20, 3)
+
+
+def wrap_label(text: str, width: int = 18, max_lines: int = 3) -> str:
+    """Wrap label at spaces to reduce overlap. Returns up to max_lines lines joined by \n."""
+    if not text:
+        return ""
+    words = str(text).split()
+    lines = []
+    cur = []
+    cur_len = 0
+    for w in words:
+        if cur_len + (1 if cur else 0) + len(w) > width:
+            lines.append(" ".join(cur))
+            cur = [w]
+            cur_len = len(w)
+            if len(lines) >= max_lines - 1:
+                # last line: keep the current word and drop the rest
+                lines.append(" ".join(cur))
+                break
+        else:
+            cur.append(w)
+            cur_len += (1 if cur_len else 0) + len(w)
+    else:
+        if cur:
+            lines.append(" ".join(cur))
+    return "\n".join(lines[:max_lines])
+
+
+def display_label(kind: str, text: str) -> str:
+    """Wrapped label exactly as it is rendered for a node of `kind`."""
+    if str(kind).lower().startswith("person"):
+        width, max_lines = PERSON_LABEL_WRAP
+    else:
+        width, max_lines = PUB_LABEL_WRAP
+    return wrap_label(text, width=width, max_lines=max_lines)
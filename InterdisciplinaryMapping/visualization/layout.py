@@ -1,6 +1,66 @@
 from typing import Dict, Tuple
 import math
 
+# Arc length per node on a ring when no label boxes are given. Rings keep
+# their minimum radius for small maps and grow with the node count beyond it.
+RING_SPACING = 50
+# Extra space between neighbouring label boxes (matches overlap.remove_overlaps)
+RING_PADDING = 6.0
+# Room left on top of the exact fit, so a small misfit stays local instead of
+# pushing every node around the ring
+RING_SLACK = 1.15
+
+
+def ring_arcs(ids, boxes=None, padding: float = RING_PADDING, angles: Dict[str, float] = None) -> list:
+    """Arc length between each node in `ids` and the next one around the ring.
+
+    With `boxes` ({node_id: (width, height, dy)}, see visualization.overlap)
+    each gap is the shortest step along the ring at that angle that keeps the
+    two boxes apart: wide labels need more room near the top and bottom of the
+    ring, tall ones near the sides. Nodes without a box take no room of their
+    own. The angle of each gap is estimated from the node's index unless
+    `angles` ({node_id: radians}) gives the nodes' actual placement. Without
+    boxes every gap is RING_SPACING.
+    """
+    n = len(ids)
+    if boxes is None:
+        return [float(RING_SPACING)] * n
+    arcs = []
+    for i, nid in enumerate(ids):
+        wa, ha, _ = boxes.get(nid, (0.0, 0.0, 0.0))
+        wb, hb, _ = boxes.get(ids[(i + 1) % n], (0.0, 0.0, 0.0))
+        # the ring runs along (-sin, cos) halfway between the two nodes
+        if angles is None:
+            theta = 2.0 * math.pi * (i + 0.5) / n
+        else:
+            ta = angles[nid]
+            theta = ta + ((angles[ids[(i + 1) % n]] - ta) % (2.0 * math.pi)) / 2.0
+        sx, sy = abs(math.sin(theta)), abs(math.cos(theta))
+        need_x = ((wa + wb) / 2.0 + padding) / sx if sx > 1e-6 else math.inf
+        need_y = ((ha + hb) / 2.0 + padding) / sy if sy > 1e-6 else math.inf
+        arcs.append(RING_SLACK * min(need_x, need_y))
+    return arcs
+
+
+def ring_radii(inner_arc: float, outer_arc: float, inner_radius: int, outer_radius: int) -> Tuple[float, float]:
+    """(inner, outer) radii fitting rings of the given total arc length, keeping the gap between the rings."""
+    inner = max(float(inner_radius), inner_arc / (2.0 * math.pi))
+    outer = max(float(outer_radius), outer_arc / (2.0 * math.pi), inner + outer_radius - inner_radius)
+    return inner, outer
+
+
+def _place_on_ring(pos, ids, arcs, radius: float, start: float = 0.0, span: float = 2.0 * math.pi):
+    """Write ids into `pos` along an arc of `span` radians, spaced in proportion to `arcs`."""
+    total = sum(arcs)
+    if total <= 0:
+        # nothing on this ring is rendered; spread the ids evenly
+        arcs, total = [1.0] * len(ids), float(len(ids))
+    along = 0.0
+    for nid, arc in zip(ids, arcs):
+        theta = start + span * along / total
+        pos[nid] = (int(round(radius * math.cos(theta))), int(round(radius * math.sin(theta))))
+        along += arc
+
 
 def bipartite_positions(nodes_df) -> Dict[str, Tuple[int, int]]:
     people = []
@@ -57,9 +117,7 @@ def bipartite_positions(nodes_df) -> Dict[str, Tuple[int, int]]:
 
 def person_publication_counts(edges_df):
     counts = {}
-    for _, erow in edges_df.iterrows():
-        s = str(erow["source"])
-        t = str(erow["target"])
+    for s, t in zip(edges_df["source"].astype(str), edges_df["target"].astype(str)):
         if s.startswith("person:"):
             counts[s] = counts.get(s, 0) + 1
         if t.startswith("person:"):
@@ -67,42 +125,89 @@ def person_publication_counts(edges_df):
     return counts
 
 
-def pubs_around_people_positions(nodes_df, inner_radius: int = 380, outer_radius: int = 700) -> Dict[str, Tuple[int, int]]:
-    """Place people on inner circle and publications on outer circle."""
+def pubs_around_people_positions(nodes_df, inner_radius: int = 380, outer_radius: int = 700,
+                                 boxes=None) -> Dict[str, Tuple[int, int]]:
+    """Place people on inner circle and publications on outer circle.
+
+    With `boxes` (see visualization.overlap.label_boxes) nodes are spaced by
+    their label size and the rings grow until every label fits, so the
+    overlap pass only has small local fixes left to do.
+    """
     people = []
     pubs = []
-    for _, row in nodes_df.iterrows():
-        if str(row["kind"]).lower().startswith("person"):
-            people.append(row)
-        else:
-            pubs.append(row)
+    for nid, label, kind in zip(nodes_df["id"], nodes_df["label"], nodes_df["kind"]):
+        ring = people if str(kind).lower().startswith("person") else pubs
+        ring.append((str(label).lower(), str(nid)))  # id matches nodes.csv
 
-    def _sort_key(r):
-        return str(r["label"]).lower()
-
-    people.sort(key=_sort_key)
-    pubs.sort(key=_sort_key)
+    people_ids = [nid for _, nid in sorted(people, key=lambda r: r[0])]
+    pub_ids = [nid for _, nid in sorted(pubs, key=lambda r: r[0])]
+    people_arcs = ring_arcs(people_ids, boxes)
+    pub_arcs = ring_arcs(pub_ids, boxes)
+    inner_radius, outer_radius = ring_radii(sum(people_arcs), sum(pub_arcs), inner_radius, outer_radius)
 
     pos: Dict[str, Tuple[int, int]] = {}
+    # Inner ring for people, outer ring for publications
+    _place_on_ring(pos, people_ids, people_arcs, inner_radius)
+    _place_on_ring(pos, pub_ids, pub_arcs, outer_radius)
+    return pos
+
 
-    # Inner ring for people
-    n_people = len(people)
-    if n_people > 0:
-        for i, r in enumerate(people):
-            nid = str(r["id"])  # matches nodes.csv id
-            theta = (2.0 * math.pi * i) / n_people
-            x = int(round(inner_radius * math.cos(theta)))
-            y = int(round(inner_radius * math.sin(theta)))
-            pos[nid] = (x, y)
-
-    # Outer ring for publications
-    n_pubs = len(pubs)
-    if n_pubs > 0:
-        for i, r in enumerate(pubs):
-            nid = str(r["id"])  # matches nodes.csv id
-            theta = (2.0 * math.pi * i) / n_pubs
-            x = int(round(outer_radius * math.cos(theta)))
-            y = int(round(outer_radius * math.sin(theta)))
-            pos[nid] = (x, y)
+def community_sector_positions(nodes_df, communities: Dict[str, int], inner_radius: int = 380, outer_radius: int = 700,
+                               boxes=None) -> Dict[str, Tuple[int, int]]:
+    """Rings like pubs_around_people_positions, split into one angular sector per community.
+
+    Each community gets a sector wide enough for its people on the inner ring
+    and its publications on the outer ring, so a cluster reads as one wedge.
+    Publications without authors share a last sector.
+    """
+    groups: Dict[int, Dict[str, list]] = {}
+    for nid, label, kind in zip(nodes_df["id"], nodes_df["label"], nodes_df["kind"]):
+        nid = str(nid)
+        cid = communities.get(nid, -1)
+        ring = "people" if str(kind).lower().startswith("person") else "pubs"
+        # people without edges are not rendered, so they get no slot
+        if cid < 0 and ring == "people":
+            continue
+        groups.setdefault(cid, {"people": [], "pubs": []})[ring].append((str(label).lower(), nid))
+
+    order = sorted(cid for cid in groups if cid >= 0) + ([-1] if -1 in groups else [])
+    pos: Dict[str, Tuple[int, int]] = {}
+    if not order:
+        return pos
 
+    # Sectors are sized from the arc their members need on each ring. The gaps
+    # depend on where the nodes end up, so place once from an index-based
+    # estimate and once more from the resulting angles.
+    angles = None
+    for _ in range(2 if boxes is not None else 1):
+        rings = {}
+        for ring in ("people", "pubs"):
+            ids = [nid for cid in order for _, nid in sorted(groups[cid][ring])]
+            arcs = ring_arcs(ids, boxes, angles=angles)
+            by_sector, i = [], 0
+            for cid in order:
+                k = len(groups[cid][ring])
+                by_sector.append((ids[i:i + k], arcs[i:i + k]))
+                i += k
+            rings[ring] = by_sector
+        radii = ring_radii(sum(sum(a) for _, a in rings["people"]), sum(sum(a) for _, a in rings["pubs"]),
+                           inner_radius, outer_radius)
+
+        # A sector spans the larger of its two angular needs; then the rings
+        # are scaled so the sectors exactly fill the circle
+        spans = [max(sum(rings[ring][j][1]) / radius for ring, radius in zip(("people", "pubs"), radii))
+                 for j in range(len(order))]
+        scale = sum(spans) / (2.0 * math.pi)
+        if scale > 1.0:
+            radii = (radii[0] * scale, radii[1] * scale)
+        spans = [span / scale for span in spans]
+
+        start = 0.0
+        for j, span in enumerate(spans):
+            for ring, radius in zip(("people", "pubs"), radii):
+                ids, arcs = rings[ring][j]
+                if ids:
+                    _place_on_ring(pos, ids, arcs, radius, start, span)
+            start += span
+        angles = {nid: math.atan2(y, x) for nid, (x, y) in pos.items()}
     return pos
@@ -1,41 +1,40 @@
 from pathlib import Path
-from pyvis.network import Network
 
+from visualization.bundling import BUNDLE_COLOR
+from visualization.community import community_color
+from visualization.delta import network_snapshot, write_snapshot
+from visualization.labels import display_label
 
-def build_network(nodes_df, edges_df, people_meta, pubs_meta, pos_map, person_pub_counts, out_path: Path) -> Path:
-    net = Network(height="750px", width="100%", bgcolor="#FFFFFF", font_color="black", notebook=False)
 
-    def _wrap_label(text: str, width: int = 18, max_lines: int = 3) -> str:
-        """Wrap label at spaces to reduce overlap. Returns up to max_lines lines joined by \n."""
-        if not text:
-            return ""
-        words = str(text).split()
-        lines = []
-        cur = []
-        cur_len = 0
-        for w in words:
-            if cur_len + (1 if cur else 0) + len(w) > width:
-                lines.append(" ".join(cur))
-                cur = [w]
-                cur_len = len(w)
-                if len(lines) >= max_lines - 1:
-                    # last line: append remaining words truncated
-                    remain = " ".join([cur] + words[words.index(w)+1:]) if False else " ".join(cur)
-                    lines.append(remain)
-                    break
-            else:
-                cur.append(w)
-                cur_len += (1 if cur_len else 0) + len(w)
-        else:
-            if cur:
-                lines.append(" ".join(cur))
-        return "\n".join(lines[:max_lines])
+def build_network(nodes_df, edges_df, people_meta, pubs_meta, pos_map, person_pub_counts, out_path: Path,
+                  communities: dict = None, color_by: str = "subteam", snapshot_path: Path = None,
+                  bundles: tuple = None, people: list = None, embed_data: bool = True,
+                  write_page: bool = True, layout: dict = None, views: dict = None) -> Path:
+    """Write the pyvis graph to `out_path`.
+
+    `communities` ({node_id: cluster}) is stored on each node as `community`;
+    with color_by="community" nodes are colored by cluster instead of subteam.
+    `snapshot_path` also writes the rendered nodes/edges, plus the people
+    selector entries `people`, the filter `views` and the `layout` inputs, as a versioned snapshot (see
+    visualization/delta.py). With embed_data=False the page is written
+    without nodes and edges, for a page that loads them from versioned files;
+    write_page=False only writes the snapshot, for rebuilds whose page stays the same.
+    `bundles` is the (anchors, bundles, membership) result of
+    visualization.bundling.bundle_edges: member edges are written hidden and
+    tagged `bundled`, and each bundle becomes one weighted edge between anchors.
+    """
+    from pyvis.edge import Edge
+    from pyvis.network import Network  # heavy; imported only when a page is rendered
+
+    communities = communities or {}
+    by_community = (color_by == "community" and bool(communities))
+    net = Network(height="750px", width="100%", bgcolor="#FFFFFF", font_color="black", notebook=False)
 
     # Add nodes
-    for _, row in nodes_df.iterrows():
-        node_id = str(row['id'])
-        label = str(row['label'])
-        kind = str(row['kind']).lower()
+    for node_id, label, kind in zip(nodes_df['id'], nodes_df['label'], nodes_df['kind']):
+        node_id = str(node_id)
+        label = str(label)
+        kind = str(kind).lower()
         color = "#87CEEB" if kind.startswith("person") else "#90EE90"
         raw_id = node_id.split(":", 1)[1] if ":" in node_id else node_id
         x, y = pos_map.get(node_id, (None, None))
@@ -56,21 +55,27 @@ def build_network(nodes_df, edges_df, people_meta, pubs_meta, pos_map, person_pu
                 "develop": "#99d968",
             }
             person_color = subteam_colors.get(st, color)
+            community = communities.get(node_id, -1)
+            if by_community and community >= 0:
+                person_color = community_color(community)
             tooltip = f"<b>{full_name}</b>" + (f"<br/>Subteam: {subteam}" if subteam else "")
             if pub_count:
                 tooltip += f"<br/>Publications: {pub_count}"
-            display_label = _wrap_label(label, width=18, max_lines=2)
+            if community >= 0:
+                tooltip += f"<br/>Cluster: {community + 1}"
+            wrapped = display_label("person", label)
             net.add_node(
                 node_id,
-                label=display_label,
+                label=wrapped,
                 color=person_color,
                 title=tooltip,
                 origColor=person_color,
                 PI=bool(meta.get("PI", False)),
                 kind="person",
                 full_name=full_name,
-                origLabel=display_label,
+                origLabel=wrapped,
                 subteam=subteam,
+                community=community,
                 value=max(pub_count, 1),
                 x=x if x is not None else 0,
                 y=y if y is not None else 0,
@@ -104,15 +109,19 @@ def build_network(nodes_df, edges_df, people_meta, pubs_meta, pos_map, person_pu
             if author_names: tooltip_lines.append("Authors: " + ", ".join(author_names))
             if doi: tooltip_lines.append(f"DOI: {doi}")
             if pi_count >= 2: tooltip_lines.append(f"PI authors: {pi_count}")
+            community = communities.get(node_id, -1)
+            if community >= 0: tooltip_lines.append(f"Cluster: {community + 1}")
             tooltip = "<br/>".join(tooltip_lines)
             # Highlight publications with 2+ PI authors
             pub_color = "#90EE90"
+            if by_community and community >= 0:
+                pub_color = community_color(community)
             if pi_count >= 2:
                 pub_color = "#F6C445"  # amber
-            display_label = _wrap_label(label, width=20, max_lines=3)
+            wrapped = display_label("pub", label)
             net.add_node(
                 node_id,
-                label=display_label,
+                label=wrapped,
                 color=pub_color,
                 title=tooltip,
                 origColor=pub_color,
@@ -123,25 +132,60 @@ def build_network(nodes_df, edges_df, people_meta, pubs_meta, pos_map, person_pu
                 year=year,
                 doi=(doi or ""),
                 authors=author_names,
-                origLabel=display_label,
+                community=community,
+                origLabel=wrapped,
                 x=x if x is not None else 0,
                 y=y if y is not None else 0,
                 fixed=True,
                 physics=False,
             )
 
+    anchors, bundle_list, membership = bundles or ({}, [], {})
+    for anchor_id, (x, y) in anchors.items():
+        # invisible junction point for bundle edges
+        net.add_node(anchor_id, label=" ", shape="dot", size=1, color="rgba(0,0,0,0)", kind="anchor",
+                     x=x, y=y, fixed=True, physics=False)
+
+    # Network.add_edge scans every edge for a duplicate, which is quadratic on
+    # large maps; skip duplicates with a set and append the same edge dicts.
+    # Like add_edge, only link nodes that were added (an author id missing
+    # from the personnel data has no node), but count them instead of failing.
+    seen = set()
+    dropped = []
+
+    def add_edge(source, target, **options):
+        if source not in net.node_map or target not in net.node_map:
+            dropped.append((source, target))
+            return
+        key = frozenset((source, target))
+        if key not in seen:
+            seen.add(key)
+            net.edges.append(Edge(source, target, net.directed, **options).options)
+
     # Add edges with a darker color and fixed width for better contrast
-    for _, row in edges_df.iterrows():
-        net.add_edge(
-            str(row['source']),
-            str(row['target']),
-            color="#666666",
-            width=1,
-        )
+    for source, target in zip(edges_df['source'].astype(str), edges_df['target'].astype(str)):
+        bundle_id = membership.get((source, target))
+        if bundle_id is not None:
+            add_edge(source, target, color="#666666", width=1, hidden=True, bundled=bundle_id)
+        else:
+            add_edge(source, target, color="#666666", width=1)
+
+    for b in bundle_list:
+        add_edge(b["from"], b["to"], color=BUNDLE_COLOR, width=b["width"], title=f"{b['count']} links",
+                 kind="bundle", bundle=b["id"])
+
+    if dropped:
+        print(f"⚠️ Skipped {len(dropped)} edges to nodes that are not in the graph, e.g. {dropped[0][0]} → {dropped[0][1]}")
 
     # Disable physics to keep layout positions fixed
     net.toggle_physics(False)
 
+    if snapshot_path is not None:
+        write_snapshot(network_snapshot(net.nodes, net.edges, people, layout, views), snapshot_path)
+    if not embed_data:
+        net.nodes, net.edges = [], []
+
     out = out_path.resolve()
-    net.write_html(str(out), open_browser=False, notebook=False)
+    if write_page:
+        net.write_html(str(out), open_browser=False, notebook=False)
     return out
@@ -0,0 +1,194 @@
+"""Post-layout pass that pushes apart overlapping nodes and labels.
+
+Each node gets an estimated bounding box (dot plus the wrapped label drawn
+underneath it) and a uniform grid is used as spatial index, so every pass only
+compares boxes that share or touch a grid cell instead of all pairs. The grid
+only stays sparse when the layout already leaves room for the boxes, which is
+why the ring layouts in visualization/layout.py take the same boxes; the pass
+is left with local fixes, and its total work is capped for other layouts.
+"""
+from typing import Dict, Tuple
+import math
+
+from visualization.labels import display_label
+
+# Mirrors the vis-network options set in assets/vis_ui.js
+# (nodes.scaling min/max and scaling.label min/max) and vis defaults.
+PERSON_SIZE_RANGE = (12, 40)
+PERSON_FONT_RANGE = (12, 22)
+PUB_SIZE = 25
+PUB_FONT = 14
+
+# (width, height, dy): box size and vertical offset of its center from the node
+Box = Tuple[float, float, float]
+
+
+def label_boxes(nodes_df, person_pub_counts, char_width: float = 0.6, line_height: float = 1.25) -> Dict[str, Box]:
+    """Estimate the on-screen box of every rendered node and its label."""
+    counts = [int(c) for c in person_pub_counts.values() if int(c) > 0]
+    vmin = min(counts) if counts else 1
+    vmax = max(counts) if counts else 1
+
+    boxes: Dict[str, Box] = {}
+    for node_id, label, kind in zip(nodes_df["id"], nodes_df["label"], nodes_df["kind"]):
+        node_id = str(node_id)
+        kind = str(kind).lower()
+        if kind.startswith("person"):
+            count = int(person_pub_counts.get(node_id, 0))
+            # people without publications are not rendered
+            if count <= 0:
+                continue
+            scale = 0.5 if vmax == vmin else (count - vmin) / float(vmax - vmin)
+            size = PERSON_SIZE_RANGE[0] + scale * (PERSON_SIZE_RANGE[1] - PERSON_SIZE_RANGE[0])
+            font = PERSON_FONT_RANGE[0] + scale * (PERSON_FONT_RANGE[1] - PERSON_FONT_RANGE[0])
+        else:
+            size = PUB_SIZE
+            font = PUB_FONT
+
+        lines = display_label(kind, str(label)).split("\n")
+        text_w = max(len(ln) for ln in lines) * font * char_width
+        text_h = len(lines) * font * line_height
+        width = max(2.0 * size, text_w)
+        height = 2.0 * size + text_h
+        # the label hangs below the dot, so the box center sits lower than the node
+        boxes[node_id] = (width, height, text_h / 2.0)
+    return boxes
+
+
+def _cell_pairs(grid, forward):
+    """Every pair of nodes sharing a grid cell or sitting in neighbouring cells, once."""
+    for (gx, gy), members in grid.items():
+        for ox, oy in forward:
+            others = members if (ox, oy) == (0, 0) else grid.get((gx + ox, gy + oy))
+            if not others:
+                continue
+            for i, a in enumerate(members):
+                for b in others[i + 1:] if others is members else others:
+                    yield a, b
+
+
+def _grid_key(x: float, y: float, box: Box, cell: float) -> Tuple[int, int]:
+    return int(math.floor(x / cell)), int(math.floor((y + box[2]) / cell))
+
+
+def _hits(nid, x, y, xs, ys, boxes, grid, cell, padding) -> bool:
+    """Whether `nid`'s box at (x, y) overlaps a box already in `grid`."""
+    w, h, d = boxes[nid]
+    gx, gy = _grid_key(x, y, boxes[nid], cell)
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            for other in grid.get((gx + ox, gy + oy), ()):
+                wo, ho, do = boxes[other]
+                if (abs(xs[other] - x) < (w + wo) / 2.0 + padding
+                        and abs(ys[other] + do - y - d) < (h + ho) / 2.0 + padding):
+                    return True
+    return False
+
+
+def _place_around_fixed(movable, xs, ys, boxes, grid, cell, padding, max_rings):
+    """Move each of `movable` to the free spot nearest its position, one at a time.
+
+    Candidates lie on rings a quarter cell apart around the node; a node with
+    no free spot within `max_rings` stays where it is. Placed nodes are added
+    to `grid`, so later ones avoid them too.
+    """
+    step = cell / 4.0
+    for nid in movable:
+        x0, y0 = xs[nid], ys[nid]
+        placed = False
+        for ring in range(max_rings + 1):
+            count = max(1, 8 * ring)
+            for k in range(count):
+                angle = 2.0 * math.pi * k / count
+                x = x0 + ring * step * math.cos(angle)
+                y = y0 + ring * step * math.sin(angle)
+                if not _hits(nid, x, y, xs, ys, boxes, grid, cell, padding):
+                    xs[nid], ys[nid] = x, y
+                    placed = True
+                    break
+            if placed:
+                break
+        grid.setdefault(_grid_key(xs[nid], ys[nid], boxes[nid], cell), []).append(nid)
+
+
+def remove_overlaps(pos_map: Dict[str, Tuple[int, int]], boxes: Dict[str, Box], padding: float = 6.0, max_iter: int = 400,
+                    max_checks_per_node: int = 200, fixed=(), max_rings: int = 32) -> Dict[str, Tuple[int, int]]:
+    """Move nodes in `pos_map` until their boxes no longer overlap.
+
+    Uses a grid whose cells are at least as large as the biggest box, so two
+    overlapping boxes always sit in the same or in adjacent cells. A pass
+    costs one comparison per pair of boxes in neighbouring cells: linear when
+    the layout spaces nodes by their boxes, quadratic when many boxes pile up
+    in a few cells. Passes stop once `max_checks_per_node` comparisons per
+    node have been spent in total, leaving any remaining overlap in place
+    rather than stalling a render.
+
+    Nodes in `fixed` keep their position (a rebuild reusing the previous
+    layout). Then there are no passes: the fixed nodes are gridded once and
+    every other node is moved to the nearest free spot around it (see
+    _place_around_fixed), so the cost grows with the number of new nodes.
+    Positions are updated in place and `pos_map` is returned.
+    """
+    ids = sorted(nid for nid in pos_map if nid in boxes)
+    if len(ids) < 2:
+        return pos_map
+
+    xs = {nid: float(pos_map[nid][0]) for nid in ids}
+    ys = {nid: float(pos_map[nid][1]) for nid in ids}
+    cell = max(max(b[0] for b in boxes.values()), max(b[1] for b in boxes.values())) + padding
+
+    if fixed:
+        fixed = set(fixed)
+        grid: Dict[Tuple[int, int], list] = {}
+        for nid in ids:
+            if nid in fixed:
+                grid.setdefault(_grid_key(xs[nid], ys[nid], boxes[nid], cell), []).append(nid)
+        movable = [nid for nid in ids if nid not in fixed]
+        _place_around_fixed(movable, xs, ys, boxes, grid, cell, padding, max_rings)
+        for nid in movable:
+            pos_map[nid] = (int(round(xs[nid])), int(round(ys[nid])))
+        return pos_map
+
+    order = {nid: i for i, nid in enumerate(ids)}
+    # only look "forward" so each pair of cells is visited once
+    forward = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+    budget = max_checks_per_node * len(ids)
+
+    for _ in range(max_iter):
+        grid = {}
+        for nid in ids:
+            grid.setdefault(_grid_key(xs[nid], ys[nid], boxes[nid], cell), []).append(nid)
+
+        moved = False
+        for a, b in _cell_pairs(grid, forward):
+            budget -= 1
+            if budget < 0:
+                break
+            wa, ha, da = boxes[a]
+            wb, hb, db = boxes[b]
+            dx = xs[b] - xs[a]
+            dy = (ys[b] + db) - (ys[a] + da)
+            over_x = (wa + wb) / 2.0 + padding - abs(dx)
+            over_y = (ha + hb) / 2.0 + padding - abs(dy)
+            if over_x <= 0 or over_y <= 0:
+                continue
+            # separate along the axis that needs the smaller move, half a pixel
+            # past touching so float error does not re-trigger the pair next
+            # pass; ties (same center) are broken by id order
+            sign = 1.0 if order[a] < order[b] else -1.0
+            if over_x <= over_y:
+                s = (1.0 if dx > 0 else -1.0 if dx < 0 else sign) * (over_x / 2.0 + 0.5)
+                xs[a] -= s
+                xs[b] += s
+            else:
+                s = (1.0 if dy > 0 else -1.0 if dy < 0 else sign) * (over_y / 2.0 + 0.5)
+                ys[a] -= s
+                ys[b] += s
+            moved = True
+
+        if not moved or budget < 0:
+            break
+
+    for nid in ids:
+        pos_map[nid] = (int(round(xs[nid])), int(round(ys[nid])))
+    return pos_map
@@ -0,0 +1,100 @@
+"""Prebuilt search index for the page's typeahead.
+
+The index is a plain JSON object so it can be embedded in graph.html or
+written next to it:
+
+    docs: [[node_id, kind, label], ...]
+    text: [normalized searchable text per doc]
+    pre:  {one/two-char token prefix: [doc indices]}   (short queries)
+    tri:  {trigram within a token: [doc indices]}       (queries of 3+ chars)
+    people: {docs, text, pre, tri} over the people selector's entries, which
+            may include people that are not drawn (optional)
+
+assets/vis_ui.js normalizes queries the same way as `normalize` below.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List
+import json
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text) -> str:
+    """Lowercase, strip accents and collapse everything but [a-z0-9] to single spaces."""
+    if not text:
+        return ""
+    s = unicodedata.normalize("NFKD", str(text))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM.sub(" ", s).strip()
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    for i in range(len(text) - 2):
+        yield text[i:i + 3]
+
+
+def _postings(docs: List[list], texts: List[str]) -> dict:
+    pre: Dict[str, List[int]] = {}
+    tri: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        grams = set()
+        for tok in set(text.split()):
+            for k in (1, 2):
+                if len(tok) >= k:
+                    lst = pre.setdefault(tok[:k], [])
+                    if not lst or lst[-1] != i:
+                        lst.append(i)
+            grams.update(_trigrams(tok))
+        for g in grams:
+            tri.setdefault(g, []).append(i)
+
+    return {"v": 1, "docs": docs, "text": texts, "pre": pre, "tri": tri}
+
+
+def _people_docs(people_meta: dict, wanted) -> Iterable[tuple]:
+    for pid, meta in people_meta.items():
+        node_id = f"person:{pid}"
+        if wanted is not None and node_id not in wanted:
+            continue
+        name = meta.get("name", "") or pid
+        yield [node_id, "person", name], normalize(name)
+
+
+def build_search_index(people_meta: dict, pubs_meta: dict, node_ids: Iterable[str] = None,
+                       listed_ids: Iterable[str] = None) -> dict:
+    """Index person names and publication title/short_title/venue/DOI.
+
+    `node_ids` restricts the index to nodes that are actually rendered.
+    `listed_ids` adds a separate `people` index over those person nodes,
+    for the people selector, so the main search only finds drawn nodes.
+    """
+    wanted = set(node_ids) if node_ids is not None else None
+    docs: List[list] = []
+    texts: List[str] = []
+
+    for doc, text in _people_docs(people_meta, wanted):
+        docs.append(doc)
+        texts.append(text)
+
+    for pubid, meta in pubs_meta.items():
+        node_id = f"pub:{pubid}"
+        if wanted is not None and node_id not in wanted:
+            continue
+        label = meta.get("short_title") or meta.get("title") or pubid
+        fields = (meta.get("title"), meta.get("short_title"), meta.get("venue"), meta.get("doi"))
+        docs.append([node_id, "pub", label])
+        texts.append(" ".join(t for t in (normalize(f) for f in fields) if t))
+
+    index = _postings(docs, texts)
+    if listed_ids is not None:
+        listed = list(_people_docs(people_meta, set(listed_ids)))
+        index["people"] = _postings([d for d, _ in listed], [t for _, t in listed])
+    return index
+
+
+def write_search_index(index: dict, path: Path) -> Path:
+    """Write the index as compact JSON (for loading it next to graph.html)."""
+    path.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    return path
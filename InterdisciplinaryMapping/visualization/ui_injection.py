@@ -2,8 +2,31 @@ from pathlib import Path
 import json
 
 
-def inject_ui(out: Path, people_meta: dict):
-    """Inject UI, CSS, and JS into generated HTML."""
+def active_people(people_meta: dict) -> list:
+    """Entries of the page's people selector (window.AP_PEOPLE)."""
+    return [{"id": pid, "name": meta.get("name", "")} for pid, meta in people_meta.items() if bool(meta.get("active", False))]
+
+
+def inject_ui(out: Path, people_meta: dict, search_index: dict = None, search_index_url: str = None,
+              color_by: str = "subteam", ego_base: str = None, graph_version: str = None,
+              graph_manifest_url: str = None, dev_events_url: str = None, bundle_zoom: float = None,
+              view_positions: dict = None):
+    """Inject UI, CSS, and JS into generated HTML.
+
+    `search_index` (see visualization/search_index.py) is embedded in the page;
+    alternatively `search_index_url` points the page at an external copy.
+    `color_by` should match build_network so the legend describes the colors.
+    `ego_base` is the URL prefix of the ego pages linked from the info box.
+    `graph_version` is the version of the embedded graph, which pushed
+    deltas are checked against. With `graph_manifest_url` nothing
+    version-specific is embedded (no graph, people or search index), so the
+    page stays the same across builds: it loads the graph from the versioned
+    files listed in that manifest (see visualization/delta.py).
+    `dev_events_url` connects the page to the --watch dev server's event stream.
+    `bundle_zoom` is the zoom scale at which bundled edges expand.
+    `view_positions` are the precomputed filter layouts (see
+    visualization/filter_views.py); with a manifest they come from its files.
+    """
     html = out.read_text(encoding="utf-8")
 
     # Use external assets (CSS/JS) and a tiny bootstrap instead of large inline JS.
@@ -60,6 +83,10 @@ def inject_ui(out: Path, people_meta: dict):
               '  <div class="fc-body" style="display:flex; flex-direction:column; gap:6px; width:180px;">'
             '    <button id="centerGraph" style="width:100%;">Center graph</button>'
             '    <button id="toggleLabels" style="width:100%;">Labels: All</button>'
+            '    <div id="search_controls" style="width:100%;">'
+            '      <input id="im_search" type="search" placeholder="Search people, titles, venues" autocomplete="off" style="width:100%; box-sizing:border-box;">'
+            '      <div id="im_search_results" class="search-results"></div>'
+            '    </div>'
             '    <div id="filter_controls" style="border-top:1px solid #eee; margin-top:6px; padding-top:6px; width:100%;">'
             '      <div style="font-weight:600; font-size:13px; margin-bottom:4px;">Filter</div>'
             '      <label style="display:block; font-size:13px;"><input type="checkbox" id="flt_discover" checked> Discover</label>'
@@ -82,6 +109,17 @@ def inject_ui(out: Path, people_meta: dict):
         html = html.replace(network_marker, controls_html + "\n" + network_marker, 1)
 
     # Add a fixed legend box (top-left)
+    if network_marker in html and 'id="legend_box"' not in html and color_by == "community":
+        legend_html = (
+            '<div id="legend_box">'
+            '  <div style="font-weight:600; margin-bottom:6px; font-size:13px;">Legend</div>'
+            '  <div class="legend">'
+            '    <span class="hint" style="margin-left:0;">Colors: detected collaboration clusters</span>'
+            '    <span class="box pub_pi"></span> Pub (2+ PIs)'
+            '  </div>'
+            '</div>'
+        )
+        html = html.replace(network_marker, legend_html + "\n" + network_marker, 1)
     if network_marker in html and 'id="legend_box"' not in html:
         legend_html = (
             '<div id="legend_box">'
@@ -135,19 +173,36 @@ def inject_ui(out: Path, people_meta: dict):
 
     # Replace post-draw bootstrap: set AP_PEOPLE and call external initializer
     if "drawGraph();" in html:
-        ap_people = json.dumps([
-            {"id": pid, "name": meta.get("name", "")}
-            for pid, meta in people_meta.items()
-            if bool(meta.get("active", False))
-        ])
+        ap_people = json.dumps([] if graph_manifest_url else active_people(people_meta))
+        extra_js = ""
+        if graph_manifest_url:
+            # the graph, people list and search index all come from the manifest's files
+            extra_js = "window.AP_GRAPH_MANIFEST = " + json.dumps(graph_manifest_url) + ";\n"
+        elif search_index is not None:
+            extra_js = "window.AP_SEARCH = " + json.dumps(search_index, separators=(",", ":")) + ";\n"
+        elif search_index_url:
+            extra_js = "window.AP_SEARCH_URL = " + json.dumps(search_index_url) + ";\n"
+        if ego_base:
+            extra_js += "window.AP_EGO_BASE = " + json.dumps(ego_base) + ";\n"
+        if graph_version and not graph_manifest_url:
+            extra_js += "window.AP_GRAPH_VERSION = " + json.dumps(graph_version) + ";\n"
+        if view_positions and not graph_manifest_url:
+            extra_js += "window.AP_VIEW_POSITIONS = " + json.dumps(view_positions, separators=(",", ":")) + ";\n"
+        if dev_events_url:
+            extra_js += "window.AP_DEV_EVENTS = " + json.dumps(dev_events_url) + ";\n"
+        if bundle_zoom is not None:
+            extra_js += "window.AP_BUNDLE_ZOOM = " + json.dumps(bundle_zoom) + ";\n"
         bootstrap = (
             """
 // --- Copilot injected: bootstrap external UI ---
 window.AP_PEOPLE = __AP_PEOPLE_JSON__;
-if (window.IM_initUI) { try { window.IM_initUI(); } catch (e) { console && console.warn && console.warn('IM_initUI failed', e); } }
+__AP_EXTRA_JS__(function(){
+  function init(){ if (window.IM_initUI) { try { window.IM_initUI(); } catch (e) { console && console.warn && console.warn('IM_initUI failed', e); } } }
+  if (window.AP_GRAPH_MANIFEST && window.IM_loadGraph) window.IM_loadGraph(window.AP_GRAPH_MANIFEST, init); else init();
+})();
 // --- End bootstrap ---
 """
-        ).replace("__AP_PEOPLE_JSON__", ap_people)
+        ).replace("__AP_PEOPLE_JSON__", ap_people).replace("__AP_EXTRA_JS__", extra_js)
         html = html.replace("drawGraph();", "drawGraph();\n" + bootstrap, 1)
 
     out.write_text(html, encoding="utf-8")
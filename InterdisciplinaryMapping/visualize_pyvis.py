@@ -1,39 +1,272 @@
 """Convenience script to run the visualizer."""
 from pathlib import Path
+import argparse
+import importlib.util
 import os
 import webbrowser
 import subprocess
 
-from visualization.data_loader import load_csv_data, load_ndjson_meta
-from visualization.layout import bipartite_positions, person_publication_counts, pubs_around_people_positions
-from visualization.network_builder import build_network
-from visualization.ui_injection import inject_ui
+from src.filters import ViewFilter, add_view_arguments
 
 
-def main():
-    base_dir = Path(__file__).parent
-
-    # Run exporter subprocess to refresh CSVs (keeps exporter decoupled).
+def run_exporter(base_dir: Path, args, view: ViewFilter):
+    """Run the exporter subprocess to refresh the CSVs (keeps exporter decoupled)."""
+    export_cmd = ["python3", str(base_dir / "data" / "other" / "export_csv.py")]
+    if args.db:
+        export_cmd += ["--db", args.db]
+    # filters are applied by the exporter, so nodes.csv only holds what this view shows
+    export_cmd += view.to_argv()
     try:
         print("→ Running data/export_csv.py to refresh CSVs...")
-        subprocess.run(["python3", str(base_dir / "data" / "other" / "export_csv.py")], check=True)
+        subprocess.run(export_cmd, check=True)
     except subprocess.CalledProcessError as e:
         print("⚠️ Exporter failed; continuing with existing CSVs. Error:", e)
 
+
+def load_exporter(base_dir: Path):
+    """Import data/other/export_csv.py as a module (watch mode exports in-process)."""
+    spec = importlib.util.spec_from_file_location("export_csv", base_dir / "data" / "other" / "export_csv.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render(base_dir: Path, args, view: ViewFilter, changes=None, dev_events_url: str = None,
+           write_page: bool = True):
+    """Render graph.html and its side artifacts from the exported CSVs.
+
+    `changes` (a src.diff.DatasetDiff) limits ego pages to the people it
+    affects. With --delta or --watch the page loads the graph from versioned
+    files, so write_page=False (a data-only rebuild) leaves graph.html alone.
+    Returns (out, previous snapshot, current snapshot, search index);
+    snapshots are None unless --delta or --watch is set.
+    """
+    # Rendering pulls in pandas, numpy and pyvis; import them only on this path
+    from visualization.data_loader import load_csv_data, load_ndjson_meta, load_store_meta
+    from visualization.delta import diff_snapshots, load_snapshot, write_base, write_delta
+    from visualization.filter_views import filter_view_positions
+    from visualization.layout import community_sector_positions, person_publication_counts, pubs_around_people_positions
+    from visualization.network_builder import build_network
+    from visualization.overlap import label_boxes, remove_overlaps
+    from visualization.search_index import build_search_index, write_search_index
+    from visualization.ui_injection import active_people, inject_ui
+
     # Load data and metadata
     nodes, edges = load_csv_data(base_dir)
-    people_meta, pubs_meta = load_ndjson_meta(base_dir)
+    if args.db:
+        # Same view as the exporter, so metadata covers exactly the exported rows
+        from src.store import SQLiteGraphStore
+        with SQLiteGraphStore(args.db) as store:
+            people_meta, pubs_meta = load_store_meta(store, view)
+    else:
+        people_meta, pubs_meta = load_ndjson_meta(base_dir, view)
 
     # Compute layout and counts
     # Place publications on an outer ring and people inside
-    pos_map = pubs_around_people_positions(nodes)
+    communities = None
+    if args.communities:
+        from visualization.community import detect_communities
+        communities = detect_communities(edges)
     person_counts = person_publication_counts(edges)
+    boxes = label_boxes(nodes, person_counts)
+    if communities:
+        pos_map = community_sector_positions(nodes, communities, boxes=boxes)
+    else:
+        pos_map = pubs_around_people_positions(nodes, boxes=boxes)
+
+    # With snapshots, nodes already on the page keep their position so a
+    # delta only carries what really changed; new nodes start from their
+    # place in the fresh layout. A snapshot laid out from other inputs
+    # (layout flags or view) is not reused. Delete graph.snapshot.json to lay out anew.
+    snapshot = args.delta or args.watch
+    snapshot_path = base_dir / "graph.snapshot.json"
+    previous = load_snapshot(snapshot_path) if snapshot else None
+    layout = {"communities": bool(args.communities), "view": view.to_argv() if view else [],
+              "bundle": args.bundle}
+    pinned = {}
+    if previous and previous.get("layout") == layout:
+        pinned = {n["id"]: (n["x"], n["y"]) for n in previous["nodes"]
+                  if n.get("kind") in ("person", "pub") and n["id"] in pos_map}
+        pos_map.update(pinned)
+    # Resolve the remaining node/label overlaps here so the page can keep these positions
+    remove_overlaps(pos_map, boxes, fixed=pinned)
+    # Subteam / PI-only views get their own layouts, so the page's filters need no relayout
+    views = filter_view_positions(nodes, edges, people_meta, pubs_meta, person_counts, boxes)
+
+    # Merge near-parallel edges into weighted bundles using the final positions
+    bundles = None
+    if args.bundle:
+        from visualization.bundling import bundle_edges, default_sectors, sector_groups, team_groups
+        pairs = list(zip(edges["source"].astype(str), edges["target"].astype(str)))
+        if args.bundle == "community":
+            groups = communities
+        elif args.bundle == "team":
+            groups = team_groups(pos_map, people_meta, pubs_meta)
+        else:
+            groups = sector_groups(pos_map, default_sectors(len(pairs)))
+        bundles = bundle_edges(pairs, pos_map, groups)
+        print(f"→ Bundled {len(bundles[2])} of {len(pairs)} edges into {len(bundles[1])} bundle edges")
+
+    # Build network and write HTML; with snapshots the page embeds no graph data
+    out = build_network(nodes, edges, people_meta, pubs_meta, pos_map, person_counts, base_dir / "graph.html",
+                        communities=communities, color_by=args.color_by,
+                        snapshot_path=snapshot_path if snapshot else None, bundles=bundles,
+                        people=active_people(people_meta), embed_data=not snapshot,
+                        write_page=write_page or not snapshot, layout=layout, views=views)
+    current = load_snapshot(snapshot_path) if snapshot else None
+    graph_version = current["version"] if current else None
+
+    # Prebuilt typeahead index over the rendered nodes, plus a separate one over
+    # every person the people selector lists (AP_PEOPLE: active people, rendered or not)
+    rendered_ids = [str(n) for n in nodes["id"] if not str(n).startswith("person:") or person_counts.get(str(n), 0) > 0]
+    listed_ids = [f"person:{pid}" for pid, meta in people_meta.items() if meta.get("active")]
+    search_index = build_search_index(people_meta, pubs_meta, rendered_ids, listed_ids)
+
+    # Publish the graph as an immutable versioned file plus (with --delta) the
+    # delta from the previous build, so returning visitors only fetch the changes
+    if snapshot:
+        deltas_dir = out.parent / "deltas"
+        if args.delta and previous and previous.get("version") != graph_version:
+            delta_path = write_delta(diff_snapshots(previous, current), deltas_dir)
+            print(f"→ Wrote delta {delta_path.name} ({delta_path.stat().st_size} bytes)")
+        base_path = write_base(current, deltas_dir, search_index)
+        print(f"→ Wrote {base_path.name} ({base_path.stat().st_size} bytes)")
+
+    # Per-person ego-network pages, generated in parallel
+    ego_base = None
+    if args.ego_pages:
+        from src.builder import GraphBuilder
+        from src.sources import NDJSONPersonnelSource, NDJSONPublicationSource
+        from visualization.ego import affected_ego_people, write_ego_pages
+        if args.db:
+            from src.store import SQLiteGraphStore, SQLitePersonnelSource, SQLitePublicationSource
+            with SQLiteGraphStore(args.db) as store:
+                graph = GraphBuilder(SQLitePersonnelSource(store, view), SQLitePublicationSource(store, view), view).build()
+        else:
+            graph = GraphBuilder(
+                NDJSONPersonnelSource(str(base_dir / "data" / "personnel.ndjson"), view),
+                NDJSONPublicationSource(str(base_dir / "data" / "publications.ndjson"), view),
+                view,
+            ).build()
+        only = affected_ego_people(graph, changes) if changes is not None else None
+        count = write_ego_pages(graph, people_meta, pubs_meta, out.parent / "ego", only=only)
+        ego_base = "ego/"
+        print(f"→ Wrote {count} ego pages to {out.parent / 'ego'}")
+
+    # Inject UI (a page loading versioned files is the same for every build)
+    if snapshot:
+        if write_page:
+            inject_ui(out, people_meta, color_by=args.color_by, ego_base=ego_base,
+                      graph_manifest_url="deltas/manifest.json",
+                      dev_events_url=dev_events_url, bundle_zoom=args.bundle_zoom if bundles else None)
+    elif args.search_index_file:
+        index_path = write_search_index(search_index, out.parent / "search_index.json")
+        inject_ui(out, people_meta, search_index_url=index_path.name, color_by=args.color_by, ego_base=ego_base,
+                  graph_version=graph_version, view_positions=views,
+                  dev_events_url=dev_events_url, bundle_zoom=args.bundle_zoom if bundles else None)
+    else:
+        inject_ui(out, people_meta, search_index=search_index, color_by=args.color_by, ego_base=ego_base,
+                  graph_version=graph_version, view_positions=views,
+                  dev_events_url=dev_events_url, bundle_zoom=args.bundle_zoom if bundles else None)
+    return out, previous, current, search_index
+
+
+def watch_mode(base_dir: Path, args, view: ViewFilter):
+    """Serve the output locally, rebuild on data/asset edits and push the changes to open pages."""
+    from src.diff import diff_datasets
+    from src.sources import NDJSONPersonnelSource, NDJSONPublicationSource
+    from visualization.delta import diff_snapshots
+    from visualization.dev_server import EVENTS_PATH, EventHub, start_server, watch
+
+    exporter = load_exporter(base_dir)
+
+    def load_dataset():
+        return (NDJSONPersonnelSource(str(base_dir / "data" / "personnel.ndjson"), view).load_people(),
+                NDJSONPublicationSource(str(base_dir / "data" / "publications.ndjson"), view).load_publications())
+
+    exporter.export_to_csv(args.db, None, None, view)
+    state = {"dataset": load_dataset() if args.ego_pages else None}
+    out = render(base_dir, args, view, dev_events_url=EVENTS_PATH)[0]
+
+    hub = EventHub()
+    server = start_server(out.parent, hub, port=args.port)
+    url = f"http://127.0.0.1:{server.server_address[1]}/{out.name}"
+
+    def rebuild(changed):
+        events = []
+        if any(p.suffix == ".ndjson" for p in changed):
+            exporter.export_to_csv(args.db, None, None, view)
+            changes = None
+            if state["dataset"] is not None:
+                dataset = load_dataset()
+                changes = diff_datasets(state["dataset"][0], dataset[0], state["dataset"][1], dataset[1])
+                state["dataset"] = dataset
+            # open pages get the delta and a reload loads the new versioned
+            # files, so the page itself is not rewritten
+            _, previous, current, search_index = render(base_dir, args, view, changes, EVENTS_PATH, write_page=False)
+            if previous and previous["version"] != current["version"]:
+                events.append(("delta", diff_snapshots(previous, current)))
+                events.append(("search", search_index))
+        if any(p.suffix == ".js" for p in changed):
+            events.append(("reload", {}))
+        elif any(p.suffix == ".css" for p in changed):
+            events.append(("css", {}))
+        return events
+
+    # Open once; later rebuilds are pushed to the page that is already open
+    webbrowser.open(url)
+    print(f"👀 Serving {url} — watching data/*.ndjson and assets/ (Ctrl+C to stop)")
+    try:
+        watch(base_dir, ["data/*.ndjson", "assets/*"], rebuild, hub)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the data and render graph.html.")
+    parser.add_argument("--db", help="SQLite store to read records from (created from the NDJSON on first use)")
+    parser.add_argument("--communities", action="store_true",
+                        help="detect collaboration clusters and lay the rings out in one sector per cluster")
+    parser.add_argument("--color-by", choices=("subteam", "community"), default="subteam",
+                        help="node coloring (community requires --communities)")
+    parser.add_argument("--ego-pages", action="store_true",
+                        help="also write a 2-hop collaborator page per person under ego/")
+    parser.add_argument("--search-index-file", action="store_true",
+                        help="write the search index to search_index.json instead of embedding it "
+                             "(the page must then be served over http, not opened as a file)")
+    parser.add_argument("--delta", action="store_true",
+                        help="publish the graph as versioned files under deltas/ (plus a delta from the previous "
+                             "build) that a stable graph.html loads; keeps existing nodes in place")
+    parser.add_argument("--watch", action="store_true",
+                        help="serve the graph locally and rebuild/push changes when data or assets are edited")
+    parser.add_argument("--port", type=int, default=8000, help="port for --watch")
+    parser.add_argument("--bundle", choices=("sector", "community", "team"),
+                        help="draw weighted bundle edges per ring sector, cluster or subteam→team pair; "
+                             "individual links appear on zoom or selection")
+    parser.add_argument("--bundle-zoom", type=float, default=0.8,
+                        help="zoom scale at which bundles expand into individual links (default 0.8)")
+    add_view_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.color_by == "community" and not args.communities:
+        parser.error("--color-by community requires --communities")
+    if args.bundle == "community" and not args.communities:
+        parser.error("--bundle community requires --communities")
+    if args.search_index_file and not args.watch and not args.delta:
+        print("⚠️ --search-index-file: browsers block fetching search_index.json from a file:// page, so search "
+              "stays empty unless graph.html is served over http (e.g. `python -m http.server`, or use --watch).")
+    if args.delta and not args.watch:
+        print("⚠️ --delta: graph.html loads the graph from deltas/, which browsers block on a file:// page; "
+              "serve the folder over http (e.g. `python -m http.server`) to view it.")
+    view = ViewFilter.from_args(args)
+
+    base_dir = Path(__file__).parent
 
-    # Build network and write HTML
-    out = build_network(nodes, edges, people_meta, pubs_meta, pos_map, person_counts, base_dir / "graph.html")
+    if args.watch:
+        watch_mode(base_dir, args, view)
+        return
 
-    # Inject UI
-    inject_ui(out, people_meta)
+    run_exporter(base_dir, args, view)
+    out = render(base_dir, args, view)[0]
 
     # Open in browser
     opened = webbrowser.open("file://" + str(out))